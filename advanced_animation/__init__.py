@@ -9,10 +9,11 @@ import logging
 import os
 from typing import Dict, List, Any, Optional
 import time
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+from .utils.env_loader import load_dotenv_once
 
 # Load environment variables
-load_dotenv()
+load_dotenv_once()
 
 # Import logging utilities
 from .utils.logging_config import setup_logging_for_run, get_logger
@@ -79,36 +80,40 @@ class AdvancedAnimationSystem:
             
             # Generate storyboard
             storyboard = self.storyboard_generator.generate_storyboard(code_analysis)
-            logger.info(f"Generated storyboard with {len(storyboard.scenes)} scenes")
+            logger.info("Generated storyboard with %s scenes", len(storyboard.scenes))
             
             # Capture execution traces if requested
             if capture_execution:
                 self._add_execution_traces_to_storyboard(storyboard, code_analysis)
             
-            # Generate audio for all scenes
+            # Generate audio for all scenes while the scenes render; the
+            # narration requests don't depend on the rendered videos
             logger.info("🎵 Generating audio narration for scenes...")
-            try:
-                audio_files = self.audio_generator.generate_storyboard_audio(storyboard, self.output_dir)
-                logger.info(f"✅ Generated audio for {len(audio_files)} scenes")
-            except Exception as e:
-                logger.error(f"❌ Error generating audio: {e}")
-                audio_files = {}
-            
-            # Render all scenes
-            video_files = []
-            for scene in storyboard.scenes:
-                video_file = self.scene_renderer.render_scene(scene)
-                video_files.append(video_file)
-                logger.info(f"Rendered scene {scene.id}: {video_file}")
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                audio_future = executor.submit(
+                    self.audio_generator.generate_storyboard_audio, storyboard, self.output_dir
+                )
+                
+                # Render all scenes
+                video_files = self.scene_renderer.render_scenes(storyboard.scenes)
+                for scene, video_file in zip(storyboard.scenes, video_files):
+                    logger.info("Rendered scene %s: %s", scene.id, video_file)
+                
+                try:
+                    audio_files = audio_future.result()
+                    logger.info("✅ Generated audio for %s scenes", len(audio_files))
+                except Exception as e:
+                    logger.error("❌ Error generating audio: %s", e)
+                    audio_files = {}
             
             # Combine videos (simplified - in practice you'd use MoviePy)
             final_video = self._combine_videos(video_files)
             
-            logger.info(f"Animation creation completed: {final_video}")
+            logger.info("Animation creation completed: %s", final_video)
             return final_video
             
         except Exception as e:
-            logger.error(f"Error creating animation: {e}")
+            logger.error("Error creating animation: %s", e)
             raise
     
     """
@@ -123,21 +128,30 @@ class AdvancedAnimationSystem:
                                           code_analysis: Dict[str, Any]):
         """Add execution traces to storyboard scenes."""
         try:
+            # Scenes often show the same snippet, so capture each one only once
+            traces = {}
             for scene in storyboard.scenes:
                 if scene.code_snippet:
                     # Capture execution for this code snippet
-                    execution_trace = self.execution_capture.capture_execution(
-                        scene.code_snippet, 
-                        code_analysis.get('language', 'python')
-                    )
+                    execution_trace = traces.get(scene.code_snippet)
+                    if execution_trace is None:
+                        execution_trace = self.execution_capture.capture_execution(
+                            scene.code_snippet, 
+                            code_analysis.get('language', 'python')
+                        )
+                        traces[scene.code_snippet] = execution_trace
                     scene.execution_state = {
                         'trace': execution_trace,
                         'captured_at': time.time()
                     }
-                    logger.info(f"Added execution trace to scene {scene.id}")
+                    logger.info("Added execution trace to scene %s", scene.id)
                     
         except Exception as e:
-            logger.error(f"Error adding execution traces: {e}")
+            logger.error("Error adding execution traces: %s", e)
+        finally:
+            # Drop the sandbox so nothing from this code base carries over
+            # into the next animation
+            self.execution_capture.close()
     
     def _combine_videos(self, video_files: List[str]) -> str:
         """Combine multiple video files into one using VideoMerger."""
@@ -150,14 +164,14 @@ class AdvancedAnimationSystem:
             final_video_path = self.video_merger.merge_scenes(video_files)
             
             if final_video_path:
-                logger.info(f"Successfully combined {len(video_files)} videos into: {final_video_path}")
+                logger.info("Successfully combined %s videos into: %s", len(video_files), final_video_path)
                 return final_video_path
             else:
                 logger.error("Failed to combine videos")
                 return video_files[0] if video_files else ""
                 
         except Exception as e:
-            logger.error(f"Error combining videos: {e}")
+            logger.error("Error combining videos: %s", e)
             return video_files[0] if video_files else ""
     
     def save_storyboard(self, storyboard: Storyboard, filename: str = "storyboard.json") -> str:
@@ -166,7 +180,7 @@ class AdvancedAnimationSystem:
             output_path = f"{self.output_dir}/{filename}"
             return self.storyboard_generator.save_storyboard(storyboard, output_path)
         except Exception as e:
-            logger.error(f"Error saving storyboard: {e}")
+            logger.error("Error saving storyboard: %s", e)
             raise
     
     def load_storyboard(self, filepath: str) -> Storyboard:
@@ -174,7 +188,7 @@ class AdvancedAnimationSystem:
         try:
             return self.storyboard_generator.load_storyboard(filepath)
         except Exception as e:
-            logger.error(f"Error loading storyboard: {e}")
+            logger.error("Error loading storyboard: %s", e)
             raise
 
 # Convenience functions
@@ -236,12 +250,12 @@ def capture_execution(code_content: str, language: str = "python") -> ExecutionT
     Returns:
         ExecutionTrace object
     """
-    capture = RuntimeStateCapture()
-    return capture.capture_execution(code_content, language)
+    with RuntimeStateCapture() as capture:
+        return capture.capture_execution(code_content, language)
 
 # Version info
 __version__ = "1.0.0"
 __author__ = "Advanced Animation System"
 __description__ = "3Blue1Brown-style educational animations from code repositories"
 
-logger.info(f"Advanced Animation System v{__version__} loaded successfully") 
\ No newline at end of file
+logger.info("Advanced Animation System v%s loaded successfully", __version__) 
\ No newline at end of file
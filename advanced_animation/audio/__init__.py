@@ -5,6 +5,6 @@ This package provides text-to-speech functionality using ElevenLabs API
 for generating voice narration for video scenes.
 """
 
-from .audio_generator import AudioGenerator
+from .audio_generator import AudioGenerator, clear_connection_cache
 
-__all__ = ['AudioGenerator'] 
\ No newline at end of file
+__all__ = ['AudioGenerator', 'clear_connection_cache'] 
\ No newline at end of file
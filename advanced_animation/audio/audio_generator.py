@@ -6,29 +6,102 @@ for creating voice narration for video scenes.
 """
 
 import os
+import time
+import atexit
+import functools
+import shutil
+import hashlib
 import logging
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any
 from pathlib import Path
-from dotenv import load_dotenv
+
+from ..utils.env_loader import get_env, load_dotenv_once
 
 # Load environment variables
-load_dotenv()
+load_dotenv_once()
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of concurrent text-to-speech requests per storyboard
+MAX_CONCURRENT_REQUESTS = 4
+
+# Connections per host kept open by the shared HTTP session
+SESSION_POOL_SIZE = 16
+
+# Responses retried with backoff (rate limiting and transient server errors)
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Size of the chunks generated audio is written to disk in
+AUDIO_CHUNK_SIZE = 64 * 1024
+
+# Default location of the on-disk cache of generated audio. Entries are never
+# evicted, so the directory grows with every distinct narration; it is safe
+# to delete at any time.
+DEFAULT_AUDIO_CACHE_DIR = Path("~/.cache/repotovideo/audio")
+
+# Successful connection tests are reused for this many seconds
+CONNECTION_CACHE_TTL = 300
+
+# Maximum number of API keys whose connection test result is remembered
+MAX_VALIDATED_KEYS = 32
+
+# API key -> monotonic time of its last successful connection test
+_validated_keys: "OrderedDict[str, float]" = OrderedDict()
+
+def clear_connection_cache():
+    """Forget cached connection test results so the next test hits the API."""
+    _validated_keys.clear()
+
+def _temp_path(path: Path) -> Path:
+    """Temporary sibling of path, unique per process and thread, to write before replacing path."""
+    return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+@functools.lru_cache(maxsize=1)
+def _get_session() -> requests.Session:
+    """Create the HTTP session shared by every AudioGenerator, once per process."""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_maxsize=SESSION_POOL_SIZE,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset({"GET", "POST"}),
+            raise_on_status=False
+        )
+    ))
+    atexit.register(session.close)
+    return session
+
 class AudioGenerator:
     """Handles text-to-speech generation using ElevenLabs API."""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None,
+                 max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+                 cache_dir: Optional[str] = None):
         """
         Initialize the audio generator.
         
         Args:
             api_key: ElevenLabs API key. If not provided, will try to load from environment.
+            max_concurrent_requests: Maximum number of scene requests in flight at once
+                (match this to the concurrency limit of the ElevenLabs plan)
+            cache_dir: Directory for cached audio. If not provided, uses AUDIO_CACHE_DIR
+                from the environment or DEFAULT_AUDIO_CACHE_DIR.
         """
-        self.api_key = api_key or os.getenv('ELEVENLABS_API_KEY')
+        self.api_key = api_key or get_env('ELEVENLABS_API_KEY')
         self.base_url = "https://api.elevenlabs.io/v1"
+        self.max_concurrent_requests = max(1, max_concurrent_requests)
+        self.cache_dir = Path(cache_dir or get_env('AUDIO_CACHE_DIR') or DEFAULT_AUDIO_CACHE_DIR).expanduser()
+        
+        # Keep connections to the API alive across requests, threads and generators
+        self.session = _get_session()
         
         if not self.api_key:
             logger.warning("ElevenLabs API key not provided. Audio generation will be disabled.")
@@ -84,29 +157,68 @@ class AudioGenerator:
                 "voice_settings": self.default_settings
             }
             
-            logger.info(f"Generating audio for text: {text[:50]}...")
-            
-            # Make the API request
-            response = requests.post(url, json=data, headers=headers)
+            output_file = Path(output_path)
             
-            if response.status_code == 200:
-                # Save the audio file
-                output_file = Path(output_path)
+            # Identical narration with the same voice and settings is reused from disk
+            cached_file = self._get_cache_path(voice_id, data)
+            if cached_file.is_file():
                 output_file.parent.mkdir(parents=True, exist_ok=True)
-                
-                with open(output_file, 'wb') as f:
-                    f.write(response.content)
-                
-                logger.info(f"Audio generated successfully: {output_path}")
+                shutil.copyfile(cached_file, output_file)
+                logger.info("Audio reused from cache: %s", output_path)
                 return True
-            else:
-                logger.error(f"Failed to generate audio: {response.status_code} - {response.text}")
-                return False
+            
+            logger.info("Generating audio for text: %s...", text[:50])
+            
+            # Make the API request, streaming the audio instead of buffering it
+            with self.session.post(url, json=data, headers=headers, stream=True) as response:
+                if response.status_code == 200:
+                    # Save the audio file; it only appears at output_path once complete
+                    output_file.parent.mkdir(parents=True, exist_ok=True)
+                    
+                    temp_file = _temp_path(output_file)
+                    try:
+                        with open(temp_file, 'wb') as f:
+                            for chunk in response.iter_content(chunk_size=AUDIO_CHUNK_SIZE):
+                                f.write(chunk)
+                        os.replace(temp_file, output_file)
+                    finally:
+                        temp_file.unlink(missing_ok=True)
+                    
+                    self._store_in_cache(output_file, cached_file)
+                    
+                    logger.info("Audio generated successfully: %s", output_path)
+                    return True
+                else:
+                    logger.error("Failed to generate audio: %s - %s", response.status_code, response.text)
+                    return False
                 
         except Exception as e:
-            logger.error(f"Error generating audio: {e}")
+            logger.error("Error generating audio: %s", e)
             return False
     
+    def _get_cache_path(self, voice_id: str, data: Dict[str, Any]) -> Path:
+        """Get the cache file for a request, addressed by a hash of the voice and request body."""
+        # Feed the fields to the hash directly rather than serializing the body first
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (voice_id, data["model_id"], repr(sorted(data["voice_settings"].items())), data["text"]):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        key = digest.hexdigest()
+        return self.cache_dir / key[:2] / f"{key[2:]}.mp3"
+    
+    def _store_in_cache(self, audio_file: Path, cached_file: Path):
+        """Copy generated audio into the cache, replacing the entry atomically."""
+        try:
+            cached_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = _temp_path(cached_file)
+            try:
+                shutil.copyfile(audio_file, temp_file)
+                os.replace(temp_file, cached_file)
+            finally:
+                temp_file.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning("Could not cache audio %s: %s", audio_file, e)
+    
     def generate_scene_audio(self, scene_narration: str, scene_id: int, output_dir: str) -> Optional[str]:
         """
         Generate audio for a specific scene.
@@ -134,6 +246,9 @@ class AudioGenerator:
         """
         Generate audio for all scenes in a storyboard.
         
+        Scene requests are sent concurrently so the total wait is bounded by
+        the slowest batch rather than the sum of every round-trip.
+        
         Args:
             storyboard: The storyboard containing scenes
             output_dir: Directory to save audio files
@@ -145,18 +260,24 @@ class AudioGenerator:
             logger.warning("Audio generation not available for storyboard")
             return {}
         
+        # Scenes without narration have nothing to synthesize
+        scenes = [scene for scene in storyboard.scenes if scene.narration and scene.narration.strip()]
+        if not scenes:
+            logger.info("Generated audio for 0 scenes")
+            return {}
+        
         audio_files = {}
         
-        for scene in storyboard.scenes:
-            audio_path = self.generate_scene_audio(
-                scene.narration, 
-                scene.id, 
-                output_dir
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrent_requests, len(scenes))) as executor:
+            audio_paths = executor.map(
+                lambda scene: self.generate_scene_audio(scene.narration, scene.id, output_dir),
+                scenes
             )
-            if audio_path:
-                audio_files[scene.id] = audio_path
+            for scene, audio_path in zip(scenes, audio_paths):
+                if audio_path:
+                    audio_files[scene.id] = audio_path
         
-        logger.info(f"Generated audio for {len(audio_files)} scenes")
+        logger.info("Generated audio for %s scenes", len(audio_files))
         return audio_files
     
     def get_available_voices(self) -> list:
@@ -174,18 +295,18 @@ class AudioGenerator:
             url = f"{self.base_url}/voices"
             headers = {"xi-api-key": self.api_key}
             
-            response = requests.get(url, headers=headers)
+            response = self.session.get(url, headers=headers)
             
             if response.status_code == 200:
                 voices = response.json().get('voices', [])
-                logger.info(f"Found {len(voices)} available voices")
+                logger.info("Found %s available voices", len(voices))
                 return voices
             else:
-                logger.error(f"Failed to get voices: {response.status_code}")
+                logger.error("Failed to get voices: %s", response.status_code)
                 return []
                 
         except Exception as e:
-            logger.error(f"Error getting voices: {e}")
+            logger.error("Error getting voices: %s", e)
             return []
     
     def test_connection(self) -> bool:
@@ -199,9 +320,19 @@ class AudioGenerator:
             logger.warning("Cannot test connection - no API key provided")
             return False
         
+        validated_at = _validated_keys.get(self.api_key)
+        if validated_at is not None and time.monotonic() - validated_at < CONNECTION_CACHE_TTL:
+            _validated_keys.move_to_end(self.api_key)
+            return True
+        
         try:
             voices = self.get_available_voices()
+            if voices:
+                _validated_keys[self.api_key] = time.monotonic()
+                _validated_keys.move_to_end(self.api_key)
+                if len(_validated_keys) > MAX_VALIDATED_KEYS:
+                    _validated_keys.popitem(last=False)
             return len(voices) > 0
         except Exception as e:
-            logger.error(f"Connection test failed: {e}")
+            logger.error("Connection test failed: %s", e)
             return False 
\ No newline at end of file
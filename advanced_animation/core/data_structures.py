@@ -4,15 +4,33 @@ Core Data Structures
 This module defines the basic data structures used throughout the advanced animation system.
 """
 
+import sys
 import logging
 from dataclasses import dataclass, asdict
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 import json
 
+# Faster JSON serializer, falling back to the json module
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
-@dataclass
+def dumps_indented(data: Any) -> str:
+    """Serialize data to JSON indented by two spaces, with orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(data, indent=2)
+
+# Slotted dataclasses (Python 3.10+) for the records created in bulk
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
 class VisualElement:
     """Represents a visual element in the storyboard."""
     type: str
@@ -21,7 +39,7 @@ class VisualElement:
     color: str = "#1f77b4"
     size: float = 1.0
 
-@dataclass
+@dataclass(**_SLOTS)
 class AnimationStep:
     """Represents a single animation step."""
     action: str
@@ -61,7 +79,7 @@ class Storyboard:
     total_duration: float
     metadata: Dict[str, Any]
 
-@dataclass
+@dataclass(**_SLOTS)
 class ExecutionState:
     """Represents the state of code execution at a point in time."""
     timestamp: float
@@ -92,8 +110,8 @@ class DataStructureManager:
             # Convert dataclasses to dictionaries
             storyboard_dict = asdict(storyboard)
             
-            with open(output_path, 'w') as f:
-                json.dump(storyboard_dict, f, indent=2)
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(dumps_indented(storyboard_dict))
             
             logger.info(f"Storyboard saved to {output_path}")
             return output_path
@@ -106,7 +124,7 @@ class DataStructureManager:
     def load_storyboard(file_path: str) -> Storyboard:
         """Load storyboard from JSON file."""
         try:
-            with open(file_path, 'r') as f:
+            with open(file_path, 'r', encoding='utf-8') as f:
                 storyboard_data = json.load(f)
             
             # Reconstruct dataclass objects
@@ -8,18 +8,20 @@ visualization of algorithm execution traces.
 import os
 import sys
 import logging
+import threading
 import json
 import time
 import tempfile
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from pathlib import Path
 import numpy as np
 import ast
 import inspect
-from dotenv import load_dotenv
+
+from ..utils.env_loader import load_dotenv_once
 
 # Load environment variables
-load_dotenv()
+load_dotenv_once()
 
 from .data_structures import ExecutionState, ExecutionTrace
 
@@ -32,10 +34,14 @@ try:
 except ImportError as e:
     E2B_AVAILABLE = False
     logger = logging.getLogger(__name__)
-    logger.warning(f"E2B not available: {e}")
+    logger.warning("E2B not available: %s", e)
 
 logger = logging.getLogger(__name__)
 
+# Keywords marking the lines that get a simulated state, per language
+JAVASCRIPT_TRACE_KEYWORDS = ('function', 'for', 'while', 'if', 'const', 'let', 'var')
+JAVA_TRACE_KEYWORDS = ('public', 'private', 'class', 'method', 'for', 'while', 'if')
+
 class RuntimeStateCapture:
     """Captures runtime execution states using E2B sandbox."""
     
@@ -50,7 +56,51 @@ class RuntimeStateCapture:
         self.state_history = []
         self.debug_mode = True
         
-        logger.info(f"RuntimeStateCapture initialized with max execution time: {max_execution_time}s")
+        # E2B sandbox reused by this instance's captures until close();
+        # the lock keeps concurrent captures from sharing its files
+        self._sandbox = None
+        self._sandbox_lock = threading.Lock()
+        
+        # Per-language handlers, keyed by lower-cased language name
+        self._capturers = {
+            "python": self._capture_python_execution,
+            "javascript": self._capture_javascript_execution,
+            "java": self._capture_java_execution
+        }
+        self._simulators = {
+            "python": self._simulate_python_execution,
+            "javascript": self._simulate_javascript_execution,
+            "java": self._simulate_java_execution
+        }
+        
+        logger.info("RuntimeStateCapture initialized with max execution time: %ss", max_execution_time)
+    
+    def __enter__(self) -> "RuntimeStateCapture":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """Close this capture's E2B sandbox, if one was started."""
+        with self._sandbox_lock:
+            self._close_sandbox()
+    
+    def _close_sandbox(self):
+        """Close the sandbox (caller holds the lock); errors from an unusable sandbox are ignored."""
+        sandbox, self._sandbox = self._sandbox, None
+        if sandbox is not None:
+            try:
+                sandbox.close()
+            except Exception as e:
+                logger.debug("Error closing E2B sandbox: %s", e)
+    
+    def _get_sandbox(self):
+        """Start this capture's E2B sandbox on first use (caller holds the lock)."""
+        if self._sandbox is None:
+            self._sandbox = Sandbox(template="base")
+            logger.info("Started E2B sandbox with template: base")
+        return self._sandbox
     
     def capture_execution(self, code_content: str, language: str = "python") -> ExecutionTrace:
         """
@@ -64,99 +114,113 @@ class RuntimeStateCapture:
             ExecutionTrace object with complete execution history
         """
         try:
-            logger.info(f"Starting execution capture for {language} code")
+            logger.info("Starting execution capture for %s code", language)
             
             if not E2B_AVAILABLE:
                 logger.warning("E2B not available, using simulation")
                 return self._simulate_execution_trace(code_content, language)
             
-            if language.lower() == "python":
-                return self._capture_python_execution(code_content)
-            elif language.lower() == "javascript":
-                return self._capture_javascript_execution(code_content)
-            elif language.lower() == "java":
-                return self._capture_java_execution(code_content)
-            else:
-                logger.warning(f"Language {language} not supported, using simulation")
+            capturer = self._capturers.get(language.lower())
+            if capturer is None:
+                logger.warning("Language %s not supported, using simulation", language)
                 return self._simulate_execution_trace(code_content, language)
+            return capturer(code_content)
                 
         except Exception as e:
-            logger.error(f"Error capturing execution: {e}")
+            logger.error("Error capturing execution: %s", e)
             return self._simulate_execution_trace(code_content, language)
     
     def _capture_python_execution(self, code_content: str) -> ExecutionTrace:
         """Capture Python code execution using E2B."""
-        try:
-            logger.info("Capturing Python execution with E2B")
-            
-            # Create instrumented code
-            instrumented_code = self._instrument_python_code(code_content)
+        logger.info("Capturing Python execution with E2B")
+        
+        # Create instrumented code
+        instrumented_code = self._instrument_python_code(code_content)
+        
+        with self._sandbox_lock:
+            # A reused sandbox may have timed out or been dropped by the
+            # backend since its last use, so a failure on it gets one retry
+            reused = self._sandbox is not None
+            try:
+                return self._run_python_capture(self._get_sandbox(), code_content, instrumented_code)
+            except Exception as e:
+                # Close the sandbox and start a fresh one next time in case it is unusable
+                self._close_sandbox()
+                if not reused:
+                    logger.error("Error in Python execution capture: %s", e)
+                    raise
+                logger.warning("Reused E2B sandbox failed (%s), retrying on a fresh sandbox", e)
             
-            with Sandbox(template="base") as sandbox:
-                # Write the instrumented code
-                sandbox.filesystem.write("/main.py", instrumented_code)
-                
-                # Start execution
-                proc = sandbox.process.start("python /main.py")
+            try:
+                return self._run_python_capture(self._get_sandbox(), code_content, instrumented_code)
+            except Exception as e:
+                logger.error("Error in Python execution capture: %s", e)
+                self._close_sandbox()
+                raise
+    
+    def _run_python_capture(self, sandbox, code_content: str, instrumented_code: str) -> ExecutionTrace:
+        """Run instrumented Python code in an E2B sandbox and collect its states."""
+        # Write the instrumented code and reset state left by earlier runs
+        sandbox.filesystem.write("/main.py", instrumented_code)
+        sandbox.filesystem.write("/tmp/execution_state.json", "{}")
+        
+        # Start execution
+        proc = sandbox.process.start("python /main.py")
+        
+        states = []
+        start_time = time.time()
+        
+        while proc.is_running and (time.time() - start_time) < self.max_execution_time:
+            try:
+                # Read output
+                stdout = proc.stdout.read()
+                stderr = proc.stderr.read()
                 
-                states = []
-                start_time = time.time()
+                # Get variable states
+                variables = self._get_python_variables(sandbox)
                 
-                while proc.is_running and (time.time() - start_time) < self.max_execution_time:
-                    try:
-                        # Read output
-                        stdout = proc.stdout.read()
-                        stderr = proc.stderr.read()
-                        
-                        # Get variable states
-                        variables = self._get_python_variables(sandbox)
-                        
-                        # Get call stack
-                        call_stack = self._get_python_call_stack(sandbox)
-                        
-                        # Create state
-                        state = ExecutionState(
-                            timestamp=time.time() - start_time,
-                            line_number=self._get_current_line(sandbox),
-                            variables=variables,
-                            call_stack=call_stack,
-                            stdout=stdout,
-                            stderr=stderr
-                        )
-                        
-                        states.append(state)
-                        
-                        if self.debug_mode:
-                            logger.debug(f"Captured state at {state.timestamp}s: {len(variables)} variables")
-                        
-                        time.sleep(0.1)  # Capture every 100ms
-                        
-                    except Exception as e:
-                        logger.error(f"Error capturing state: {e}")
-                        break
+                # Get call stack
+                call_stack = self._get_python_call_stack(sandbox)
                 
-                # Final state
-                if proc.is_running:
-                    proc.kill()
+                # Create state
+                state = ExecutionState(
+                    timestamp=time.time() - start_time,
+                    line_number=self._get_current_line(sandbox),
+                    variables=variables,
+                    call_stack=call_stack,
+                    stdout=stdout,
+                    stderr=stderr
+                )
                 
-                total_duration = time.time() - start_time
+                states.append(state)
                 
-                logger.info(f"Execution capture completed: {len(states)} states, {total_duration:.2f}s")
+                if self.debug_mode:
+                    logger.debug("Captured state at %ss: %s variables", state.timestamp, len(variables))
                 
-                return ExecutionTrace(
-                    code_content=code_content,
-                    language="python",
-                    states=states,
-                    total_duration=total_duration,
-                    metadata={
-                        "capture_method": "e2b_sandbox",
-                        "debug_mode": self.debug_mode
-                    }
-                )
+                time.sleep(0.1)  # Capture every 100ms
                 
-        except Exception as e:
-            logger.error(f"Error in Python execution capture: {e}")
-            raise
+            except Exception as e:
+                logger.error("Error capturing state: %s", e)
+                break
+        
+        # Final state
+        if proc.is_running:
+            proc.kill()
+        
+        total_duration = time.time() - start_time
+        
+        logger.info("Execution capture completed: %s states, %.2fs", len(states), total_duration)
+        
+        return ExecutionTrace(
+            code_content=code_content,
+            language="python",
+            states=states,
+            total_duration=total_duration,
+            metadata={
+                "capture_method": "e2b_sandbox",
+                "debug_mode": self.debug_mode
+            }
+        )
     
     def _instrument_python_code(self, code_content: str) -> str:
         """Add instrumentation to Python code for state capture."""
@@ -174,8 +238,8 @@ class RuntimeStateCapture:
             ]
             
             # Create instrumentation code
-            instrumented_code = "\n".join(imports) + "\n\n"
-            instrumented_code += """
+            header = "\n".join(imports) + "\n\n"
+            header += """
 # State capture setup
 def capture_state():
     state = {
@@ -204,10 +268,16 @@ def capture_state():
 
 # Original code follows:
 """
-            instrumented_code += code_content
+            
+            # Keep the code as a list of lines and join once at the end,
+            # rather than appending it to the header and splitting it again.
+            # The header ends with a newline, so its last (empty) line is
+            # where the code's first line goes.
+            lines = header.split('\n')
+            lines.pop()
+            lines.extend(code_content.split('\n'))
             
             # Add state capture calls at key points
-            lines = instrumented_code.split('\n')
             instrumented_lines = []
             
             for i, line in enumerate(lines):
@@ -220,7 +290,7 @@ def capture_state():
             return '\n'.join(instrumented_lines)
             
         except Exception as e:
-            logger.error(f"Error instrumenting Python code: {e}")
+            logger.error("Error instrumenting Python code: %s", e)
             return code_content
     
     def _get_python_variables(self, sandbox) -> Dict[str, Any]:
@@ -236,7 +306,7 @@ def capture_state():
                 return self._get_variables_from_debugger(sandbox)
                 
         except Exception as e:
-            logger.error(f"Error getting Python variables: {e}")
+            logger.error("Error getting Python variables: %s", e)
             return {}
     
     def _get_variables_from_debugger(self, sandbox) -> Dict[str, Any]:
@@ -248,7 +318,7 @@ def capture_state():
                 "timestamp": time.time()
             }
         except Exception as e:
-            logger.error(f"Error getting variables from debugger: {e}")
+            logger.error("Error getting variables from debugger: %s", e)
             return {}
     
     def _get_python_call_stack(self, sandbox) -> List[str]:
@@ -262,7 +332,7 @@ def capture_state():
                 return ["main()"]
                 
         except Exception as e:
-            logger.error(f"Error getting Python call stack: {e}")
+            logger.error("Error getting Python call stack: %s", e)
             return ["main()"]
     
     def _get_current_line(self, sandbox) -> int:
@@ -276,7 +346,7 @@ def capture_state():
                 return 0
                 
         except Exception as e:
-            logger.error(f"Error getting current line: {e}")
+            logger.error("Error getting current line: %s", e)
             return 0
     
     def _capture_javascript_execution(self, code_content: str) -> ExecutionTrace:
@@ -289,7 +359,7 @@ def capture_state():
             return self._simulate_execution_trace(code_content, "javascript")
             
         except Exception as e:
-            logger.error(f"Error capturing JavaScript execution: {e}")
+            logger.error("Error capturing JavaScript execution: %s", e)
             return self._simulate_execution_trace(code_content, "javascript")
     
     def _capture_java_execution(self, code_content: str) -> ExecutionTrace:
@@ -302,30 +372,24 @@ def capture_state():
             return self._simulate_execution_trace(code_content, "java")
             
         except Exception as e:
-            logger.error(f"Error capturing Java execution: {e}")
+            logger.error("Error capturing Java execution: %s", e)
             return self._simulate_execution_trace(code_content, "java")
     
     def _simulate_execution_trace(self, code_content: str, language: str) -> ExecutionTrace:
         """Simulate execution trace when E2B is not available."""
         try:
-            logger.info(f"Simulating execution trace for {language}")
+            logger.info("Simulating execution trace for %s", language)
             
             states = []
             start_time = time.time()
             
             # Parse code to understand structure
-            if language.lower() == "python":
-                states = self._simulate_python_execution(code_content)
-            elif language.lower() == "javascript":
-                states = self._simulate_javascript_execution(code_content)
-            elif language.lower() == "java":
-                states = self._simulate_java_execution(code_content)
-            else:
-                states = self._simulate_generic_execution(code_content)
+            simulator = self._simulators.get(language.lower(), self._simulate_generic_execution)
+            states = simulator(code_content)
             
             total_duration = time.time() - start_time
             
-            logger.info(f"Simulated execution trace: {len(states)} states")
+            logger.info("Simulated execution trace: %s states", len(states))
             
             return ExecutionTrace(
                 code_content=code_content,
@@ -339,7 +403,7 @@ def capture_state():
             )
             
         except Exception as e:
-            logger.error(f"Error simulating execution trace: {e}")
+            logger.error("Error simulating execution trace: %s", e)
             raise
     
     def _simulate_python_execution(self, code_content: str) -> List[ExecutionState]:
@@ -377,7 +441,7 @@ def capture_state():
             if states:
                 final_state = ExecutionState(
                     timestamp=step * 0.5,
-                    line_number=len(code_content.split('\n')),
+                    line_number=code_content.count('\n') + 1,
                     variables={"completed": True},
                     call_stack=["main()"],
                     stdout="Execution completed",
@@ -388,91 +452,74 @@ def capture_state():
             return states
             
         except Exception as e:
-            logger.error(f"Error simulating Python execution: {e}")
+            logger.error("Error simulating Python execution: %s", e)
             return []
     
     def _simulate_javascript_execution(self, code_content: str) -> List[ExecutionState]:
         """Simulate JavaScript execution trace."""
         try:
-            states = []
-            
             # Simple simulation based on code structure
-            lines = code_content.split('\n')
-            
-            for i, line in enumerate(lines):
-                if any(keyword in line for keyword in ['function', 'for', 'while', 'if', 'const', 'let', 'var']):
-                    state = ExecutionState(
-                        timestamp=i * 0.3,
-                        line_number=i + 1,
-                        variables={
-                            "line": i + 1,
-                            "content": line.strip()
-                        },
-                        call_stack=["main()"],
-                        stdout=f"Executing line {i + 1}",
-                        stderr=""
-                    )
-                    states.append(state)
-            
-            return states
+            return self._simulate_line_states(
+                code_content, 0.3, "Executing",
+                lambda line: any(keyword in line for keyword in JAVASCRIPT_TRACE_KEYWORDS)
+            )
             
         except Exception as e:
-            logger.error(f"Error simulating JavaScript execution: {e}")
+            logger.error("Error simulating JavaScript execution: %s", e)
             return []
     
     def _simulate_java_execution(self, code_content: str) -> List[ExecutionState]:
         """Simulate Java execution trace."""
         try:
-            states = []
-            
             # Simple simulation based on code structure
-            lines = code_content.split('\n')
-            
-            for i, line in enumerate(lines):
-                if any(keyword in line for keyword in ['public', 'private', 'class', 'method', 'for', 'while', 'if']):
-                    state = ExecutionState(
-                        timestamp=i * 0.4,
-                        line_number=i + 1,
-                        variables={
-                            "line": i + 1,
-                            "content": line.strip()
-                        },
-                        call_stack=["main()"],
-                        stdout=f"Executing line {i + 1}",
-                        stderr=""
-                    )
-                    states.append(state)
-            
-            return states
+            return self._simulate_line_states(
+                code_content, 0.4, "Executing",
+                lambda line: any(keyword in line for keyword in JAVA_TRACE_KEYWORDS)
+            )
             
         except Exception as e:
-            logger.error(f"Error simulating Java execution: {e}")
+            logger.error("Error simulating Java execution: %s", e)
             return []
     
     def _simulate_generic_execution(self, code_content: str) -> List[ExecutionState]:
         """Simulate generic execution trace."""
         try:
-            states = []
-            
-            lines = code_content.split('\n')
-            
-            for i, line in enumerate(lines):
-                if line.strip():  # Non-empty lines
-                    state = ExecutionState(
-                        timestamp=i * 0.2,
-                        line_number=i + 1,
-                        variables={
-                            "line": i + 1,
-                            "content": line.strip()
-                        },
-                        call_stack=["main()"],
-                        stdout=f"Processing line {i + 1}",
-                        stderr=""
-                    )
-                    states.append(state)
-            
-            return states
+            # Non-empty lines
+            return self._simulate_line_states(
+                code_content, 0.2, "Processing",
+                lambda line: line.strip()
+            )
             
         except Exception as e:
-            logger.error(f"Error simulating generic execution: {e}")
-            return [] 
\ No newline at end of file
+            logger.error("Error simulating generic execution: %s", e)
+            return []
+    
+    def _simulate_line_states(self, code_content: str, step_time: float, action: str,
+                              is_traced: Callable[[str], Any]) -> List[ExecutionState]:
+        """
+        Build one simulated state for each source line selected by is_traced.
+        
+        Args:
+            code_content: Source code to simulate
+            step_time: Simulated seconds per source line
+            action: Verb used in each state's stdout ("Executing line 3")
+            is_traced: Predicate choosing the lines that get a state
+            
+        Returns:
+            List of ExecutionState objects in line order
+        """
+        return [
+            ExecutionState(
+                timestamp=i * step_time,
+                line_number=i + 1,
+                variables={
+                    "line": i + 1,
+                    "content": line.strip()
+                },
+                call_stack=["main()"],
+                stdout=f"{action} line {i + 1}",
+                stderr=""
+            )
+            for i, line in enumerate(code_content.split('\n'))
+            if is_traced(line)
+        ]
@@ -5,25 +5,30 @@ This module converts code analysis into 3Blue1Brown-style visual storyboards
 using GPT-4 for concept abstraction and visual metaphor generation.
 """
 
-import os
 import json
 import logging
 import openai
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set, Tuple
 from pathlib import Path
+from itertools import islice
 import time
-from dotenv import load_dotenv
+
+from ..utils.env_loader import get_env, load_dotenv_once
 
 # Load environment variables
-load_dotenv()
+load_dotenv_once()
 
 from .data_structures import (
     Storyboard, StoryboardScene, VisualElement, 
-    AnimationStep, CameraMovement, DataStructureManager
+    AnimationStep, CameraMovement, DataStructureManager, dumps_indented
 )
 
 logger = logging.getLogger(__name__)
 
+# Function-name keywords used to spot algorithms and data structures
+ALGORITHM_KEYWORDS = ('sort', 'search', 'traverse', 'compute', 'calculate')
+DATA_STRUCTURE_KEYWORDS = ('array', 'list', 'tree', 'graph', 'stack', 'queue', 'hash', 'map')
+
 class StoryboardGenerator:
     """AI-powered storyboard generator using GPT-4."""
     
@@ -34,7 +39,7 @@ class StoryboardGenerator:
         Args:
             openai_api_key: OpenAI API key for GPT-4 access
         """
-        self.openai_api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
+        self.openai_api_key = openai_api_key or get_env("OPENAI_API_KEY")
         if self.openai_api_key:
             openai.api_key = self.openai_api_key
             self.client = openai.OpenAI(api_key=self.openai_api_key)
@@ -93,7 +98,7 @@ class StoryboardGenerator:
         Returns:
             Storyboard object with scenes and animations
         """
-        logger.info(f"Generating storyboard for code analysis with {len(code_analysis.get('files', []))} files")
+        logger.info("Generating storyboard for code analysis with %s files", len(code_analysis.get('files', [])))
         
         if self.client:
             return self._generate_ai_storyboard(code_analysis)
@@ -108,12 +113,16 @@ class StoryboardGenerator:
         max_retries = 3
         base_delay = 2  # Base delay in seconds
         
+        prompt = None
+        
         for attempt in range(max_retries):
             try:
-                logger.info(f"Using GPT-4 for AI-powered storyboard generation (attempt {attempt + 1}/{max_retries})")
+                logger.info("Using GPT-4 for AI-powered storyboard generation (attempt %s/%s)", attempt + 1, max_retries)
                 
-                # Prepare the prompt
-                prompt = self._create_storyboard_prompt(code_analysis)
+                # Prepare the prompt once; serializing the analysis is the costly
+                # part and it is the same for every attempt
+                if prompt is None:
+                    prompt = self._create_storyboard_prompt(code_analysis)
                 
                 # Call GPT-4 with different models as fallback
                 models_to_try = [
@@ -143,20 +152,20 @@ class StoryboardGenerator:
                 
                 # Parse the response
                 storyboard_data = json.loads(response.choices[0].message.content)
-                logger.info(f"Successfully generated AI storyboard with {len(storyboard_data.get('scenes', []))} scenes using {model}")
+                logger.info("Successfully generated AI storyboard with %s scenes using %s", len(storyboard_data.get('scenes', [])), model)
                 
                 return self._parse_storyboard_response(storyboard_data, code_analysis)
                 
             except Exception as e:
                 error_msg = str(e)
-                logger.warning(f"Attempt {attempt + 1} failed: {error_msg}")
+                logger.warning("Attempt %s failed: %s", attempt + 1, error_msg)
                 
                 # Check if it's a rate limit error
                 if "429" in error_msg or "rate limit" in error_msg.lower() or "quota" in error_msg.lower():
                     if attempt < max_retries - 1:
                         # Exponential backoff with jitter
                         delay = base_delay * (2 ** attempt) + random.uniform(0, 1)
-                        logger.info(f"Rate limited. Waiting {delay:.1f} seconds before retry...")
+                        logger.info("Rate limited. Waiting %.1f seconds before retry...", delay)
                         time.sleep(delay)
                         continue
                     else:
@@ -164,7 +173,7 @@ class StoryboardGenerator:
                         break
                 else:
                     # For other errors, don't retry
-                    logger.error(f"Non-retryable error: {error_msg}")
+                    logger.error("Non-retryable error: %s", error_msg)
                     break
         
         logger.info("Falling back to rule-based storyboard generation")
@@ -188,7 +197,7 @@ class StoryboardGenerator:
         Complexity: {complexity}
         
         Code Analysis Details:
-        {json.dumps(code_analysis, indent=2)}
+        {dumps_indented(code_analysis)}
         
         Output JSON format:
         {{
@@ -298,13 +307,13 @@ class StoryboardGenerator:
         for file_path in files.keys():
             if isinstance(file_path, str):
                 # Extract directory structure
-                parts = file_path.split('/')
+                parts = file_path.rsplit('/', 2)
                 if len(parts) > 1:
                     main_dir = parts[-2] if len(parts) > 2 else parts[0]
                     directories.add(main_dir)
                 
                 # Extract file extension
-                ext = file_path.split('.')[-1] if '.' in file_path else 'unknown'
+                ext = file_path.rpartition('.')[2] if '.' in file_path else 'unknown'
                 file_types[ext] = file_types.get(ext, 0) + 1
         
         return {
@@ -324,8 +333,8 @@ class StoryboardGenerator:
         
         for file_info in files.values():
             total_lines += file_info.get('lines', 0)
-            total_functions += len(file_info.get('functions', []))
-            total_classes += len(file_info.get('classes', []))
+            total_functions += len(file_info.get('functions', ()))
+            total_classes += len(file_info.get('classes', ()))
         
         avg_function_length = total_lines / total_functions if total_functions > 0 else 0
         
@@ -357,16 +366,29 @@ class StoryboardGenerator:
         # you would analyze the code for data structure usage
         return ['lists', 'dictionaries', 'sets', 'tuples']  # Default data structures
     
+    def _get_file_totals(self, files: Dict[str, Any]) -> Tuple[int, int, int, Set[str]]:
+        """Total lines, functions and classes, and the languages seen, in one pass over the files."""
+        total_lines = 0
+        total_functions = 0
+        total_classes = 0
+        languages = set()
+        
+        for file_info in files.values():
+            total_lines += file_info.get('lines', 0)
+            total_functions += len(file_info.get('functions', ()))
+            total_classes += len(file_info.get('classes', ()))
+            if file_info.get('language') != 'unknown':
+                languages.add(file_info.get('language', 'unknown'))
+        
+        return total_lines, total_functions, total_classes, languages
+    
     def _get_scene_metadata(self, code_analysis: Dict[str, Any]) -> Dict[str, Any]:
         """Get standardized metadata for all scenes."""
         files = code_analysis.get('files', {})
         
         # Calculate totals
         total_files = len(files)
-        total_lines = sum(file_info.get('lines', 0) for file_info in files.values())
-        total_functions = sum(len(file_info.get('functions', [])) for file_info in files.values())
-        total_classes = sum(len(file_info.get('classes', [])) for file_info in files.values())
-        languages = set(file_info.get('language', 'unknown') for file_info in files.values() if file_info.get('language') != 'unknown')
+        total_lines, total_functions, total_classes, languages = self._get_file_totals(files)
         
         # Get additional data
         file_structure = self._get_file_structure(code_analysis)
@@ -673,7 +695,7 @@ class StoryboardGenerator:
         files = code_analysis.get('files', {})
         total_files = len(files)
         
-        logger.info(f"Creating intro scene with {total_files} files")
+        logger.info("Creating intro scene with %s files", total_files)
         
         # Extract key metrics with detailed logging
         languages = set()
@@ -685,7 +707,7 @@ class StoryboardGenerator:
             lang = file_info.get('language', 'unknown')
             if lang != 'unknown':
                 languages.add(lang)
-                logger.info(f"Found language '{lang}' in file: {file_path}")
+                logger.info("Found language '%s' in file: %s", lang, file_path)
             
             lines = file_info.get('lines', 0)
             total_lines += lines
@@ -696,9 +718,10 @@ class StoryboardGenerator:
             cls = len(file_info.get('classes', []))
             classes += cls
             
-            logger.debug(f"File {file_path}: {lang}, {lines} lines, {funcs} functions, {cls} classes")
+            logger.debug("File %s: %s, %s lines, %s functions, %s classes", file_path, lang, lines, funcs, cls)
         
-        logger.info(f"Total metrics: {len(languages)} languages ({list(languages)}), {total_lines} lines, {functions} functions, {classes} classes")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Total metrics: %s languages (%s), %s lines, %s functions, %s classes", len(languages), list(languages), total_lines, functions, classes)
         
         # Get additional data for metadata
         file_structure = self._get_file_structure(code_analysis)
@@ -787,7 +810,7 @@ class StoryboardGenerator:
         """Create scene showing file structure and organization."""
         files = code_analysis.get('files', {})
         
-        logger.info(f"Creating file structure scene with {len(files)} files")
+        logger.info("Creating file structure scene with %s files", len(files))
         
         # Analyze file structure with detailed logging
         file_types = {}
@@ -796,19 +819,20 @@ class StoryboardGenerator:
         for file_path in files.keys():
             if isinstance(file_path, str):
                 # Extract directory structure
-                parts = file_path.split('/')
+                parts = file_path.rsplit('/', 2)
                 if len(parts) > 1:
                     # Get the main directory (second to last part for nested structures)
                     main_dir = parts[-2] if len(parts) > 2 else parts[0]
                     directories.add(main_dir)
-                    logger.debug(f"Found directory: {main_dir} from path: {file_path}")
+                    logger.debug("Found directory: %s from path: %s", main_dir, file_path)
                 
                 # Extract file extension
-                ext = file_path.split('.')[-1] if '.' in file_path else 'unknown'
+                ext = file_path.rpartition('.')[2] if '.' in file_path else 'unknown'
                 file_types[ext] = file_types.get(ext, 0) + 1
-                logger.debug(f"Found file type: .{ext} from path: {file_path}")
+                logger.debug("Found file type: .%s from path: %s", ext, file_path)
         
-        logger.info(f"File structure analysis: {len(directories)} directories ({list(directories)}), {len(file_types)} file types ({list(file_types.keys())})")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("File structure analysis: %s directories (%s), %s file types (%s)", len(directories), list(directories), len(file_types), list(file_types.keys()))
         
         # Create visual elements for file structure
         visual_elements = [
@@ -822,7 +846,7 @@ class StoryboardGenerator:
         
         # Add directory structure
         y_pos = 1.5
-        for i, directory in enumerate(list(directories)[:6]):  # Show first 6 directories
+        for i, directory in enumerate(islice(directories, 6)):  # Show first 6 directories
             visual_elements.append(VisualElement(
                 type="text",
                 properties={"text": f"📁 {directory}/", "font_size": 24},
@@ -832,7 +856,7 @@ class StoryboardGenerator:
         
         # Add file type distribution
         y_pos = 1.5
-        for i, (ext, count) in enumerate(list(file_types.items())[:6]):  # Show first 6 file types
+        for i, (ext, count) in enumerate(islice(file_types.items(), 6)):  # Show first 6 file types
             visual_elements.append(VisualElement(
                 type="text",
                 properties={"text": f"📄 .{ext}: {count} files", "font_size": 20},
@@ -855,10 +879,7 @@ class StoryboardGenerator:
         
         # Calculate totals for metadata
         total_files = len(files)
-        total_lines = sum(file_info.get('lines', 0) for file_info in files.values())
-        total_functions = sum(len(file_info.get('functions', [])) for file_info in files.values())
-        total_classes = sum(len(file_info.get('classes', [])) for file_info in files.values())
-        languages = set(file_info.get('language', 'unknown') for file_info in files.values() if file_info.get('language') != 'unknown')
+        total_lines, total_functions, total_classes, languages = self._get_file_totals(files)
         
         return StoryboardScene(
             id=scene_id,
@@ -885,7 +906,7 @@ class StoryboardGenerator:
         """Create scene showing programming language distribution."""
         files = code_analysis.get('files', {})
         
-        logger.info(f"Creating language analysis scene with {len(files)} files")
+        logger.info("Creating language analysis scene with %s files", len(files))
         
         # Count languages with detailed logging
         language_counts = {}
@@ -893,11 +914,11 @@ class StoryboardGenerator:
             lang = file_info.get('language', 'unknown')
             if lang != 'unknown':
                 language_counts[lang] = language_counts.get(lang, 0) + 1
-                logger.debug(f"Found language '{lang}' in file: {file_path}")
+                logger.debug("Found language '%s' in file: %s", lang, file_path)
             else:
-                logger.warning(f"Unknown language for file: {file_path}")
+                logger.warning("Unknown language for file: %s", file_path)
         
-        logger.info(f"Language distribution: {language_counts}")
+        logger.info("Language distribution: %s", language_counts)
         
         # Create pie chart visualization
         visual_elements = [
@@ -940,10 +961,7 @@ class StoryboardGenerator:
         
         # Calculate totals for metadata
         total_files = len(files)
-        total_lines = sum(file_info.get('lines', 0) for file_info in files.values())
-        total_functions = sum(len(file_info.get('functions', [])) for file_info in files.values())
-        total_classes = sum(len(file_info.get('classes', [])) for file_info in files.values())
-        languages = set(file_info.get('language', 'unknown') for file_info in files.values() if file_info.get('language') != 'unknown')
+        total_lines, total_functions, total_classes, languages = self._get_file_totals(files)
         
         return StoryboardScene(
             id=scene_id,
@@ -1041,7 +1059,7 @@ class StoryboardGenerator:
         
         for file_path, file_info in files.items():
             for func in file_info.get('functions', []):
-                func_name = f"{file_path.split('/')[-1]}.{func.get('name', 'unknown')}"
+                func_name = f"{file_path.rpartition('/')[2]}.{func.get('name', 'unknown')}"
                 calls = func.get('calls', [])
                 call_graph[func_name] = calls
                 function_nodes.append(func_name)
@@ -1115,7 +1133,7 @@ class StoryboardGenerator:
             ),
             VisualElement(
                 type="text",
-                properties={"text": f"📄 Analyzing: {python_file.split('/')[-1]}", "font_size": 20},
+                properties={"text": f"📄 Analyzing: {python_file.rpartition('/')[2]}", "font_size": 20},
                 position={"x": 0, "y": -2.5, "z": 0},
                 color="#FF9800"
             )
@@ -1146,9 +1164,9 @@ class StoryboardGenerator:
         # Find algorithms in the codebase
         algorithms = []
         for file_info in files.values():
-            for func in file_info.get('functions', []):
+            for func in file_info.get('functions', ()):
                 func_name = func.get('name', '').lower()
-                if any(algo in func_name for algo in ['sort', 'search', 'traverse', 'compute', 'calculate']):
+                if any(algo in func_name for algo in ALGORITHM_KEYWORDS):
                     algorithms.append(func.get('name', 'unknown'))
         
         if not algorithms:
@@ -1200,10 +1218,10 @@ class StoryboardGenerator:
         # Analyze data structures used
         data_structures = set()
         for file_info in files.values():
-            for func in file_info.get('functions', []):
+            for func in file_info.get('functions', ()):
                 # Look for data structure patterns in function names and calls
                 func_name = func.get('name', '').lower()
-                if any(ds in func_name for ds in ['array', 'list', 'tree', 'graph', 'stack', 'queue', 'hash', 'map']):
+                if any(ds in func_name for ds in DATA_STRUCTURE_KEYWORDS):
                     data_structures.add(func_name.split('_')[0])
         
         if not data_structures:
@@ -1220,7 +1238,7 @@ class StoryboardGenerator:
         
         # Add different data structure visualizations
         x_positions = [-3, 0, 3]
-        for i, ds in enumerate(list(data_structures)[:3]):
+        for i, ds in enumerate(islice(data_structures, 3)):
             visual_elements.append(VisualElement(
                 type=ds,
                 properties={"size": 1.5, "values": [1, 2, 3, 4, 5]},
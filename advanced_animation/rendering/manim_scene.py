@@ -6,6 +6,7 @@ This module handles the creation and rendering of ManimGL scenes for
 """
 
 import os
+import re
 import sys
 import logging
 import numpy as np
@@ -19,6 +20,15 @@ import time
 from ..core.data_structures import StoryboardScene, VisualElement, AnimationStep, CameraMovement
 from ..visualizations.visual_metaphors import VisualMetaphorLibrary
 
+# Patterns for pulling repository statistics out of (lower-cased) scene narration
+_FILES_RE = re.compile(r'(\d+)\s*files?')
+_LINES_OF_CODE_RE = re.compile(r'(\d+)\s*lines?\s*of\s*code')
+_FUNCTIONS_RE = re.compile(r'(\d+)\s*functions?')
+_CLASSES_RE = re.compile(r'(\d+)\s*classes?')
+_LANGUAGES_RE = re.compile(r'(\d+)\s*languages?')
+_COMPLEXITY_RE = re.compile(r'complexity\s*of\s*([\d.]+)')
+_FUNCTION_CALL_RE = re.compile(r'(\w+)\s*\(\)')
+
 # ManimGL imports (3Blue1Brown's original version)
 try:
     from manimlib import *
@@ -317,12 +327,13 @@ class ManimSceneRenderer:
         
         logger.info(f"ManimSceneRenderer initialized with output directory: {output_dir}")
     
-    def render_scene(self, storyboard_scene: StoryboardScene) -> str:
+    def render_scene(self, storyboard_scene: StoryboardScene, scene_code: Optional[str] = None) -> str:
         """
         Render a single scene to video.
         
         Args:
             storyboard_scene: Scene to render
+            scene_code: Code already generated for the scene, if any
             
         Returns:
             Path to the rendered video file
@@ -335,7 +346,7 @@ class ManimSceneRenderer:
             logger.info(f"Rendering scene {storyboard_scene.id}: {storyboard_scene.concept}")
             
             # Create scene file
-            scene_file = self.create_scene_file(storyboard_scene)
+            scene_file = self.create_scene_file(storyboard_scene, scene_code)
             
             # Render the scene
             output_file = self.render_with_manim(scene_file)
@@ -350,15 +361,123 @@ class ManimSceneRenderer:
             logger.error(f"Error rendering scene {storyboard_scene.id}: {e}")
             return self.create_fallback_video(storyboard_scene)
     
-    def create_scene_file(self, storyboard_scene: StoryboardScene) -> Path:
-        """Create a temporary scene file for rendering."""
+    def render_scenes(self, storyboard_scenes: List[StoryboardScene]) -> List[str]:
+        """
+        Render several scenes, sharing one Manim process where possible.
+        
+        With Manim Community Edition all scenes are written to one file and
+        rendered by a single ``manim`` invocation, so the interpreter and
+        Manim import cost is paid once instead of once per scene. Scenes the
+        batch could not produce are rendered individually.
+        
+        Args:
+            storyboard_scenes: Scenes to render
+            
+        Returns:
+            Paths to the rendered video files, in scene order
+        """
+        if MANIMGL_AVAILABLE or not MANIM_AVAILABLE or len(storyboard_scenes) < 2:
+            return [self.render_scene(scene) for scene in storyboard_scenes]
+        
+        rendered = {}
+        # id() of a scene -> code generated for it by the batch; the scenes
+        # stay referenced by storyboard_scenes for the whole call
+        generated_code = {}
+        try:
+            rendered = self.render_batch_with_manim(storyboard_scenes, generated_code)
+        except Exception as e:
+            logger.error(f"Batch rendering failed, rendering scenes individually: {e}")
+        
+        # Scenes rendered individually reuse the code generated for the batch
+        video_files = []
+        for scene in storyboard_scenes:
+            video_file = rendered.get(scene.id)
+            if video_file is None:
+                video_file = self.render_scene(scene, generated_code.get(id(scene)))
+            video_files.append(video_file)
+        return video_files
+    
+    def render_batch_with_manim(self, storyboard_scenes: List[StoryboardScene],
+                                generated_code: Optional[Dict[int, str]] = None) -> Dict[int, str]:
+        """
+        Render all scenes from one generated file in a single Manim process.
+        
+        Returns scene id -> video file for the scenes that rendered. If
+        generated_code is given, the code generated for each scene is stored
+        in it under id(scene), for rendering leftovers individually.
+        """
+        batch_file = self.output_dir / "scenes_batch.py"
+        
+        # Leave out scenes whose generated code does not compile; a syntax
+        # error would otherwise fail the whole batch
+        scene_codes = []
+        for scene in storyboard_scenes:
+            scene_code = self.generate_scene_code(scene)
+            if generated_code is not None:
+                generated_code[id(scene)] = scene_code
+            try:
+                compile(scene_code, f"scene_{scene.id}.py", 'exec')
+            except SyntaxError as e:
+                logger.error(f"Generated code for scene {scene.id} has a syntax error: {e}")
+                continue
+            scene_codes.append((scene, scene_code))
+        
+        if not scene_codes:
+            return {}
+        
+        storyboard_scenes = [scene for scene, _ in scene_codes]
+        scene_names = [f"Scene{scene.id}" for scene in storyboard_scenes]
+        
+        with open(batch_file, 'w') as f:
+            for _, scene_code in scene_codes:
+                f.write(scene_code)
+        
+        cmd = [
+            "manim",
+            batch_file.name,
+            *scene_names,
+            "-pql",  # Preview, quality low
+            "--format", "mp4"
+        ]
+        logger.info(f"Executing Manim batch command: {' '.join(cmd)}")
+        
+        try:
+            result = subprocess.run(
+                cmd,
+                cwd=batch_file.parent,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+                timeout=300 * len(storyboard_scenes)  # 5 minutes per scene
+            )
+        finally:
+            batch_file.unlink()
+        
+        if result.returncode != 0:
+            raise Exception(f"Batch rendering failed: {result.stderr}")
+        
+        media_dir = self.output_dir / "media" / "videos" / batch_file.stem / "480p15"
+        rendered = {}
+        for scene, scene_name in zip(storyboard_scenes, scene_names):
+            video_file = media_dir / f"{scene_name}.mp4"
+            if video_file.exists():
+                rendered[scene.id] = str(video_file)
+                logger.info(f"Scene {scene.id} rendered successfully: {video_file}")
+        return rendered
+    
+    def create_scene_file(self, storyboard_scene: StoryboardScene, scene_code: Optional[str] = None) -> Path:
+        """Create a temporary scene file for rendering (scene_code: already generated code, if any)."""
         try:
-            scene_content = self.generate_scene_code(storyboard_scene)
+            if scene_code is None:
+                scene_code = self.generate_scene_code(storyboard_scene)
+            
+            # Catch syntax errors here rather than after starting Manim
+            compile(scene_code, f"scene_{storyboard_scene.id}.py", 'exec')
             
             scene_file = self.output_dir / f"scene_{storyboard_scene.id}.py"
             
             with open(scene_file, 'w') as f:
-                f.write(scene_content)
+                f.write(scene_code)
             
             logger.info(f"Created scene file: {scene_file}")
             return scene_file
@@ -508,28 +627,27 @@ if __name__ == "__main__":
         narration = storyboard_scene.narration.lower()
         
         # Extract file count
-        import re
-        file_match = re.search(r'(\d+)\s*files?', narration)
+        file_match = _FILES_RE.search(narration)
         if file_match:
             data['files'] = int(file_match.group(1))
         
         # Extract lines of code
-        loc_match = re.search(r'(\d+)\s*lines?\s*of\s*code', narration)
+        loc_match = _LINES_OF_CODE_RE.search(narration)
         if loc_match:
             data['lines_of_code'] = int(loc_match.group(1))
         
         # Extract function count
-        func_match = re.search(r'(\d+)\s*functions?', narration)
+        func_match = _FUNCTIONS_RE.search(narration)
         if func_match:
             data['functions'] = int(func_match.group(1))
         
         # Extract class count
-        class_match = re.search(r'(\d+)\s*classes?', narration)
+        class_match = _CLASSES_RE.search(narration)
         if class_match:
             data['classes'] = int(class_match.group(1))
         
         # Extract languages
-        lang_match = re.search(r'(\d+)\s*languages?', narration)
+        lang_match = _LANGUAGES_RE.search(narration)
         if lang_match:
             lang_count = int(lang_match.group(1))
             # Default to Python if only one language
@@ -539,12 +657,12 @@ if __name__ == "__main__":
                 data['languages'] = ['Python', 'JavaScript', 'Java'][:lang_count]
         
         # Extract complexity
-        complexity_match = re.search(r'complexity\s*of\s*([\d.]+)', narration)
+        complexity_match = _COMPLEXITY_RE.search(narration)
         if complexity_match:
             data['complexity']['avg'] = float(complexity_match.group(1))
         
         # Extract function names from narration
-        func_names = re.findall(r'(\w+)\s*\(\)', narration)
+        func_names = _FUNCTION_CALL_RE.findall(narration)
         if func_names:
             data['functions_list'] = func_names[:5]  # Limit to 5 functions
         
@@ -1192,23 +1310,25 @@ AnimationStep(
             result = subprocess.run(
                 cmd,
                 cwd=scene_file.parent,
-                capture_output=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
                 text=True,
                 timeout=300  # 5 minute timeout
             )
             
             if result.returncode == 0:
                 # Find the output file in the media directory
+                # Only the first match is used, so stop listing at it
                 media_dir = self.output_dir / "media" / "videos" / f"scene_{scene_file.stem.split('_')[1]}" / "480p15"
-                if media_dir.exists():
-                    output_files = list(media_dir.glob("*.mp4"))
-                    if output_files:
-                        return str(output_files[0])
+                if media_dir.is_dir():
+                    output_file = next(media_dir.glob("*.mp4"), None)
+                    if output_file is not None:
+                        return str(output_file)
                 
                 # Fallback: look in output directory
-                output_files = list(self.output_dir.glob("*.mp4"))
-                if output_files:
-                    return str(output_files[0])
+                output_file = next(self.output_dir.glob("*.mp4"), None)
+                if output_file is not None:
+                    return str(output_file)
                 else:
                     raise Exception("No output file found after successful rendering")
             else:
@@ -8,6 +8,7 @@ import logging
 from pathlib import Path
 from typing import List, Optional
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 import json
 
 logger = logging.getLogger(__name__)
@@ -187,7 +188,7 @@ class VideoMerger:
                 '-y'
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
             
             if result.returncode == 0:
                 logger.info(f"Fallback merge successful: {output_path}")
@@ -232,7 +233,7 @@ class VideoMerger:
             temp_audio_path = self.output_dir / "temp_audio.mp3"
             output_path = self.output_dir / "final_comprehensive_analysis.mp4"
             
-            # First concatenate videos
+            # Concatenate videos and audio; the two ffmpeg runs are independent
             video_cmd = [
                 'ffmpeg',
                 '-f', 'concat',
@@ -243,13 +244,6 @@ class VideoMerger:
                 '-y'
             ]
             
-            result = subprocess.run(video_cmd, capture_output=True, text=True)
-            
-            if result.returncode != 0:
-                logger.error(f"Video concatenation failed: {result.stderr}")
-                return self.create_fallback_merge(video_files)  # Fall back to video-only
-            
-            # Then concatenate audio files
             audio_cmd = [
                 'ffmpeg',
                 '-f', 'concat',
@@ -260,7 +254,16 @@ class VideoMerger:
                 '-y'
             ]
             
-            result = subprocess.run(audio_cmd, capture_output=True, text=True)
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                video_future = executor.submit(subprocess.run, video_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+                audio_future = executor.submit(subprocess.run, audio_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+                video_result = video_future.result()
+                result = audio_future.result()
+            
+            if video_result.returncode != 0:
+                logger.error(f"Video concatenation failed: {video_result.stderr}")
+                temp_audio_path.unlink(missing_ok=True)
+                return self.create_fallback_merge(video_files)  # Fall back to video-only
             
             if result.returncode != 0:
                 logger.error(f"Audio concatenation failed: {result.stderr}")
@@ -280,13 +283,11 @@ class VideoMerger:
                 '-y'
             ]
             
-            result = subprocess.run(combine_cmd, capture_output=True, text=True)
+            result = subprocess.run(combine_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
             
             # Clean up temp files
-            if temp_video_path.exists():
-                temp_video_path.unlink()
-            if temp_audio_path.exists():
-                temp_audio_path.unlink()
+            temp_video_path.unlink(missing_ok=True)
+            temp_audio_path.unlink(missing_ok=True)
             
             if result.returncode == 0:
                 logger.info(f"Fallback merge with audio successful: {output_path}")
@@ -5,5 +5,6 @@ This package contains utility functions and classes for the advanced animation s
 """
 
 from .logging_config import LoggingManager, setup_logging_for_run, get_logger
+from .env_loader import get_env, load_dotenv_once
 
-__all__ = ['LoggingManager', 'setup_logging_for_run', 'get_logger'] 
\ No newline at end of file
+__all__ = ['LoggingManager', 'setup_logging_for_run', 'get_logger', 'get_env', 'load_dotenv_once'] 
\ No newline at end of file
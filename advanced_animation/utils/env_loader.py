@@ -0,0 +1,37 @@
+"""
+Environment Loading Utilities for Advanced Animation System
+
+This module loads the .env file once per process and reads environment
+variables used across the system.
+"""
+
+import os
+import functools
+from typing import Optional
+from dotenv import load_dotenv
+
+@functools.lru_cache(maxsize=1)
+def load_dotenv_once() -> bool:
+    """
+    Load the .env file into the process environment once per process.
+    
+    Returns:
+        True if a .env file was found and loaded
+    """
+    return load_dotenv()
+
+def get_env(key: str) -> Optional[str]:
+    """
+    Get an environment variable after making sure the .env file is loaded.
+    
+    Values are read from os.environ on every call, so keys set after
+    import (e.g. by the UI) are picked up.
+
+    Args:
+        key: Environment variable name
+
+    Returns:
+        The variable value, or None if it is not set
+    """
+    load_dotenv_once()
+    return os.environ.get(key)
@@ -6,12 +6,46 @@ to separate files for each run, making debugging and tracking easier.
 """
 
 import os
+import queue
+import atexit
 import logging
 import logging.handlers
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+from .env_loader import get_env
+
+# Listener draining the root logger's queue; only one run is logged at a time
+_active_listener: Optional[logging.handlers.QueueListener] = None
+
+def _stop_active_listener():
+    """Stop the active queue listener, flushing any pending records."""
+    global _active_listener
+    if _active_listener is not None:
+        _active_listener.stop()
+        _active_listener = None
+
+atexit.register(_stop_active_listener)
+
+# Manager created by the last setup_logging_for_run call
+_run_manager = None
+
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that reuses the formatted timestamp within the same second."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached_second = None
+        self._cached_time = None
+    
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        if second != self._cached_second:
+            self._cached_time = super().formatTime(record, datefmt)
+            self._cached_second = second
+        return self._cached_time
+
 class LoggingManager:
     """Manages logging configuration for the advanced animation system."""
     
@@ -26,10 +60,17 @@ class LoggingManager:
         self.output_dir = Path(output_dir)
         self.log_level = log_level
         self.log_file = None
+        self.listener = None
         self.setup_logging()
     
     def setup_logging(self):
-        """Setup logging configuration with file and console handlers."""
+        """Setup logging configuration with file and console handlers.
+
+        Records are put on a queue by the root logger and written to the
+        file and console handlers by a background listener thread.
+        """
+        global _active_listener
+        
         # Create logs directory if it doesn't exist
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
@@ -41,11 +82,12 @@ class LoggingManager:
         root_logger = logging.getLogger()
         root_logger.setLevel(self.log_level)
         
-        # Clear any existing handlers
+        # Clear any existing handlers and stop the previous run's listener
         root_logger.handlers.clear()
+        _stop_active_listener()
         
         # Create formatters
-        detailed_formatter = logging.Formatter(
+        detailed_formatter = _CachedTimeFormatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
         )
@@ -69,14 +111,32 @@ class LoggingManager:
         console_handler.setLevel(self.log_level)
         console_handler.setFormatter(console_formatter)
         
-        # Add handlers to root logger
-        root_logger.addHandler(file_handler)
-        root_logger.addHandler(console_handler)
+        # Route records through a queue so callers don't block on I/O
+        log_queue = queue.SimpleQueue()
+        root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        
+        self.listener = logging.handlers.QueueListener(
+            log_queue,
+            file_handler,
+            console_handler,
+            respect_handler_level=True
+        )
+        self.listener.start()
+        _active_listener = self.listener
         
         # Log the start of this session
         logger = logging.getLogger(__name__)
-        logger.info(f"Logging session started - Log file: {self.log_file}")
-        logger.info(f"Log level: {logging.getLevelName(self.log_level)}")
+        logger.info("Logging session started - Log file: %s", self.log_file)
+        logger.info("Log level: %s", logging.getLevelName(self.log_level))
+    
+    def shutdown(self):
+        """Stop the background listener and flush pending log records."""
+        global _active_listener
+        if self.listener is not None:
+            self.listener.stop()
+            if _active_listener is self.listener:
+                _active_listener = None
+            self.listener = None
     
     def get_log_file_path(self) -> Optional[Path]:
         """Get the current log file path."""
@@ -86,17 +146,21 @@ class LoggingManager:
         """Log system information for debugging."""
         logger = logging.getLogger(__name__)
         
+        # Nothing below is emitted above INFO, so skip the platform queries
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        
         import sys
         import platform
         
         logger.info("=" * 60)
         logger.info("SYSTEM INFORMATION")
         logger.info("=" * 60)
-        logger.info(f"Python version: {sys.version}")
-        logger.info(f"Platform: {platform.platform()}")
-        logger.info(f"Architecture: {platform.architecture()}")
-        logger.info(f"Processor: {platform.processor()}")
-        logger.info(f"Working directory: {os.getcwd()}")
+        logger.info("Python version: %s", sys.version)
+        logger.info("Platform: %s", platform.platform())
+        logger.info("Architecture: %s", platform.architecture())
+        logger.info("Processor: %s", platform.processor())
+        logger.info("Working directory: %s", os.getcwd())
         logger.info("=" * 60)
     
     def log_environment_info(self):
@@ -115,17 +179,20 @@ class LoggingManager:
             'PYTHONPATH'
         ]
         
+        info_enabled = logger.isEnabledFor(logging.INFO)
         for var in env_vars:
-            value = os.getenv(var)
+            value = get_env(var)
             if value:
+                if not info_enabled:
+                    continue
                 # Mask sensitive values
                 if 'API_KEY' in var:
                     masked_value = value[:8] + '*' * (len(value) - 12) + value[-4:] if len(value) > 12 else '***'
-                    logger.info(f"{var}: {masked_value}")
+                    logger.info("%s: %s", var, masked_value)
                 else:
-                    logger.info(f"{var}: {value}")
+                    logger.info("%s: %s", var, value)
             else:
-                logger.warning(f"{var}: Not set")
+                logger.warning("%s: Not set", var)
         
         logger.info("=" * 60)
 
@@ -133,6 +200,9 @@ def setup_logging_for_run(output_dir: str = "logs", log_level: int = logging.INF
     """
     Setup logging for a new run.
     
+    Repeated calls with the same settings reuse the existing manager and
+    log file instead of starting a second one.
+    
     Args:
         output_dir: Directory to store log files
         log_level: Logging level
@@ -140,9 +210,18 @@ def setup_logging_for_run(output_dir: str = "logs", log_level: int = logging.INF
     Returns:
         LoggingManager instance
     """
+    global _run_manager
+    if (_run_manager is not None
+            and _run_manager.listener is not None
+            and _run_manager.listener is _active_listener
+            and _run_manager.output_dir == Path(output_dir)
+            and _run_manager.log_level == log_level):
+        return _run_manager
+    
     manager = LoggingManager(output_dir, log_level)
     manager.log_system_info()
     manager.log_environment_info()
+    _run_manager = manager
     return manager
 
 def get_logger(name: str) -> logging.Logger:
@@ -9,16 +9,22 @@ This module provides advanced code analysis capabilities including:
 """
 
 import ast
+import importlib.util
 import subprocess
 import tempfile
 import os
 import sys
 import json
 import logging
-from typing import Dict, List, Optional, Tuple, Set, Any, Union
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterator, List, Optional, Tuple, Set, Any, Union
 from pathlib import Path
 import re
+from bisect import bisect_left
+from collections import Counter
 from dataclasses import dataclass
+from functools import lru_cache
 from enum import Enum
 
 # Tree-sitter imports
@@ -30,24 +36,140 @@ except ImportError:
     Language = None
     Parser = None
 
-# Optional imports for advanced features
-try:
-    import pycallgraph2
-    from pycallgraph2 import PyCallGraph
-    from pycallgraph2.output import GraphvizOutput
-    CALLGRAPH_AVAILABLE = True
-except ImportError:
-    CALLGRAPH_AVAILABLE = False
+# Optional packages for advanced features. Only their presence is checked,
+# so importing this module (and each analysis worker) doesn't load them.
+CALLGRAPH_AVAILABLE = importlib.util.find_spec('pycallgraph2') is not None
+DEPTREE_AVAILABLE = importlib.util.find_spec('pipdeptree') is not None
 
+# Linear-time (DFA) regex engine for the Java scanners, falling back to re
 try:
-    import pipdeptree
-    DEPTREE_AVAILABLE = True
+    import re2
+    RE2_AVAILABLE = True
 except ImportError:
-    DEPTREE_AVAILABLE = False
+    re2 = None
+    RE2_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
 
+class _Scanner:
+    """
+    A Java/JS scanning pattern compiled for both kinds of file content.
+    
+    Pure-ASCII files are scanned as raw bytes, where identifiers only need
+    ASCII classes (re2 already uses them, the stdlib fallback needs
+    re.ASCII). Other files are decoded and scanned as text so non-ASCII
+    identifiers still match.
+    """
+    __slots__ = ('ascii', 'text')
+    
+    def __init__(self, pattern: str):
+        if RE2_AVAILABLE:
+            self.ascii = re2.compile(pattern.encode())
+        else:
+            self.ascii = re.compile(pattern.encode(), re.ASCII)
+        self.text = re.compile(pattern)
+    
+    def _compiled(self, content: Union[bytes, str]):
+        return self.text if isinstance(content, str) else self.ascii
+    
+    def finditer(self, content: Union[bytes, str]):
+        return self._compiled(content).finditer(content)
+    
+    def search(self, content: Union[bytes, str], pos: int, endpos: int):
+        return self._compiled(content).search(content, pos, endpos)
+
+
+def _compile_scanner(pattern: str) -> _Scanner:
+    """Compile a Java/JS scanning pattern for raw ASCII bytes and decoded text."""
+    return _Scanner(pattern)
+
+
+def _decode(value: Union[bytes, str]) -> str:
+    """Text captured from Java/JS file content (raw ASCII bytes or decoded text)."""
+    return value if isinstance(value, str) else value.decode('ascii')
+
+
+# Pre-compiled regex patterns for regex-based (non-AST) language analysis.
+# Each Java entity kind gets its own scan: matches of different kinds can
+# overlap (a member call can contain an anonymous class method), and one
+# alternation would only report the first of them.
+_JAVA_METHOD_RE = _compile_scanner(r'(?:public|private|protected)?\s*(?:static\s+)?(?:final\s+)?(?:synchronized\s+)?(?:native\s+)?(?:abstract\s+)?(?:strictfp\s+)?(?:<[^>]+>\s+)?(?:[\w\[\]]+)\s+(\w+)\s*\([^)]*\)\s*(?:throws\s+[^{]+)?\s*\{')
+_JAVA_CLASS_RE = _compile_scanner(r'(?:public\s+)?(?:abstract\s+)?(?:final\s+)?class\s+(\w+)(?:\s+extends\s+(\w+))?(?:\s+implements\s+([^{]+))?\s*\{')
+_JAVA_IMPORT_RE = _compile_scanner(r'import\s+(?:static\s+)?([^;]+);')
+# Member call (obj.method(...)) and member assignment (obj.field =), scanned
+# separately since an assignment can sit inside a call's arguments
+_JAVA_NULL_RES = tuple(_compile_scanner(pattern) for pattern in (
+    r'(\w+)\.\w+\s*\([^)]*\)',
+    r'(\w+)\.\w+\s*='
+))
+# Declared variable names (assignment/field, for-each or catch), one capture per form
+_JAVA_DECL_RE = _compile_scanner(
+    r'[\w\[\]]+\s+(\w+)\s*[=;]'
+    r'|for\s*\([\w\[\]]+\s+(\w+)\s*:'
+    r'|catch\s*\([\w\[\]]+\s+(\w+)\s*\)'
+)
+
+# JavaScript declarations and member uses
+# Function declarations and arrow functions in one scan; each form captures
+# (name, parameters), so m.lastindex // 2 - 1 is the form that matched
+_JS_FUNCTIONS_RE = _compile_scanner(
+    r'function\s+(\w+)\s*\(([^)]*)\)\s*\{'
+    r'|(\w+)\s*=\s*\(([^)]*)\)\s*=>'
+)
+_JS_CLASS_RE = _compile_scanner(r'class\s+(\w+)(?:\s+extends\s+(\w+))?\s*\{')
+# ES6 default, named and namespace imports in one scan; each form captures
+# (names, module), so m.lastindex // 2 - 1 is the form that matched
+_JS_IMPORTS_RE = _compile_scanner(
+    r'import\s+(\w+)\s+from\s+[\'"]([^\'"]+)[\'"]'
+    r'|import\s*\{([^}]+)\}\s+from\s+[\'"]([^\'"]+)[\'"]'
+    r'|import\s+\*\s+as\s+(\w+)\s+from\s+[\'"]([^\'"]+)[\'"]'
+)
+# Possibly undefined variable uses: logged values and member access
+_JS_UNDEFINED_RES = tuple(_compile_scanner(pattern) for pattern in (
+    r'console\.log\((\w+)\)',
+    r'(\w+)\.\w+'
+))
+
+
+# Line breaks as content.splitlines() sees them, for raw bytes and for text
+_LINE_BREAK_BYTES_RE = re.compile(rb'\r\n|[\r\n]')
+_LINE_BREAK_TEXT_RE = re.compile('\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+# ASCII breaks str.splitlines() splits on but bytes.splitlines() does not
+_TEXT_ONLY_BREAK_BYTES_RE = re.compile(rb'[\x0b\x0c\x1c\x1d\x1e]')
+
+
+def _line_index(content: Union[bytes, str]) -> List[int]:
+    """
+    Offsets of every line break in content, for bisect-based line lookups.
+    
+    Breaks are the ones content.splitlines() splits on, so line numbers
+    agree with the line count and with the code snippets.
+    """
+    pattern = _LINE_BREAK_TEXT_RE if isinstance(content, str) else _LINE_BREAK_BYTES_RE
+    return [match.start() for match in pattern.finditer(content)]
+
+
+def _count_lines(content: bytes) -> int:
+    """
+    Number of lines content.splitlines() would return, counted without splitting.
+    
+    Only \\n, \\r\\n and \\r are counted, as bytes.splitlines() does; content
+    with other str.splitlines() breaks (form feeds etc.) must be decoded first.
+    """
+    breaks = content.count(b'\n') + content.count(b'\r') - content.count(b'\r\n')
+    if content and content[-1:] not in (b'\n', b'\r'):
+        breaks += 1
+    return breaks
+
+
+@lru_cache(maxsize=4096)
+def _js_decl_re(var_name: Union[bytes, str]) -> _Scanner:
+    """Compiled JavaScript declaration pattern (let/const/var/function or assignment) for a variable name."""
+    name = re.escape(_decode(var_name))
+    return _compile_scanner(r'(?:let|const|var|function)\s+' + name + r'\b|' + name + r'\s*=')
+
+
 class LanguageType(Enum):
     """Supported programming languages."""
     PYTHON = "python"
@@ -56,7 +178,27 @@ class LanguageType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+_EXT_TO_LANG = {
+    '.py': LanguageType.PYTHON,
+    '.js': LanguageType.JAVASCRIPT,
+    '.jsx': LanguageType.JAVASCRIPT,
+    '.ts': LanguageType.JAVASCRIPT,
+    '.tsx': LanguageType.JAVASCRIPT,
+    '.java': LanguageType.JAVA
+}
+
+
+@lru_cache(maxsize=64)
+def _ext_to_lang(extension: str) -> LanguageType:
+    """Map a raw file suffix to its language, ignoring case."""
+    return _EXT_TO_LANG.get(extension.lower(), LanguageType.UNKNOWN)
+
+
+# Slotted dataclasses (Python 3.10+) for the records created in bulk
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class FunctionInfo:
     """Information about a function."""
     name: str
@@ -69,7 +211,7 @@ class FunctionInfo:
     complexity: int
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ClassInfo:
     """Information about a class."""
     name: str
@@ -81,7 +223,7 @@ class ClassInfo:
     docstring: Optional[str]
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ErrorPattern:
     """Information about a detected error pattern."""
     type: str
@@ -95,15 +237,26 @@ class ErrorPattern:
 class EnhancedCodeAnalyzer:
     """Enhanced code analyzer with advanced features."""
     
-    def __init__(self, project_path: str):
+    def __init__(self, project_path: str, max_workers: Optional[int] = 1):
         """
         Initialize the code analyzer.
         
         Args:
             project_path: Path to the project directory
+            max_workers: Number of processes used to analyze files
+                (1, the default, analyzes serially; None for one per CPU)
         """
         self.project_path = Path(project_path)
+        self.max_workers = max_workers
         self.language_parsers = {}
+        # (project_path, code files, language distribution) from the last scan
+        self._code_files_cache: Optional[Tuple[Path, List[Path], Dict[str, int]]] = None
+        # Per-language (display name, analyzer) used by analyze_file
+        self._file_analyzers = {
+            LanguageType.PYTHON: ("Python", self._analyze_python_file),
+            LanguageType.JAVASCRIPT: ("JavaScript", self._analyze_javascript_file),
+            LanguageType.JAVA: ("Java", self._analyze_java_file)
+        }
         self._setup_tree_sitter()
         
     def _setup_tree_sitter(self):
@@ -125,7 +278,7 @@ class EnhancedCodeAnalyzer:
             logger.info("Tree-sitter parsers initialized")
             
         except Exception as e:
-            logger.warning(f"Failed to setup Tree-sitter parsers: {e}")
+            logger.warning("Failed to setup Tree-sitter parsers: %s", e)
     
     def analyze_project(self) -> Dict[str, Any]:
         """
@@ -134,7 +287,7 @@ class EnhancedCodeAnalyzer:
         Returns:
             Dictionary containing complete project analysis
         """
-        logger.info(f"Starting comprehensive analysis of {self.project_path}")
+        logger.info("Starting comprehensive analysis of %s", self.project_path)
         
         analysis = {
             'project_info': self._get_project_info(),
@@ -147,25 +300,28 @@ class EnhancedCodeAnalyzer:
         
         # Get all code files
         code_files = self._get_code_files()
-        logger.info(f"Found {len(code_files)} code files to analyze")
+        logger.info("Found %s code files to analyze", len(code_files))
         
         successful_analyses = 0
         failed_analyses = 0
         
-        # Analyze each file
-        for i, file_path in enumerate(code_files):
-            logger.info(f"Analyzing file {i+1}/{len(code_files)}: {file_path}")
-            try:
-                file_analysis = self.analyze_file(file_path)
-                analysis['files'][str(file_path)] = file_analysis
+        # Analyze each file; files are independent, so they can be spread over processes
+        results = self._analyze_files(code_files)
+        
+        total_files = len(code_files)
+        for i, (file_path, (file_analysis, error)) in enumerate(zip(code_files, results)):
+            file_key = str(file_path)
+            logger.info("Analyzed file %s/%s: %s", i+1, total_files, file_key)
+            if error is None:
+                analysis['files'][file_key] = file_analysis
                 analysis['error_patterns'].extend(file_analysis.get('error_patterns', []))
                 successful_analyses += 1
-                logger.info(f"✅ Successfully analyzed: {file_path}")
-            except Exception as e:
+                logger.info("✅ Successfully analyzed: %s", file_path)
+            else:
                 failed_analyses += 1
-                logger.error(f"❌ Error analyzing {file_path}: {e}")
+                logger.error("❌ Error analyzing %s: %s", file_path, error)
                 # Add a basic file entry even if analysis fails
-                analysis['files'][str(file_path)] = {
+                analysis['files'][file_key] = {
                     'language': 'unknown',
                     'size': 0,
                     'lines': 0,
@@ -174,16 +330,42 @@ class EnhancedCodeAnalyzer:
                     'imports': [],
                     'error_patterns': [],
                     'complexity': 0,
-                    'analysis_error': str(e)
+                    'analysis_error': error
                 }
         
-        logger.info(f"Analysis complete: {successful_analyses} successful, {failed_analyses} failed")
+        logger.info("Analysis complete: %s successful, %s failed", successful_analyses, failed_analyses)
         
         # Calculate project metrics
         analysis['metrics'] = self._calculate_project_metrics(analysis)
         
         return analysis
     
+    def _analyze_files(self, code_files: List[Path]) -> List[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+        """Analyze files serially, or over a process pool when max_workers allows it."""
+        if self.max_workers == 1 or len(code_files) < 2:
+            return list(map(self._analyze_file_or_error, code_files))
+        
+        workers = self.max_workers or os.cpu_count() or 1
+        chunksize = max(1, min(16, len(code_files) // (workers * 4)))
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_analysis_worker,
+                initargs=(str(self.project_path),)
+            ) as executor:
+                return list(executor.map(_analyze_file_in_worker, code_files, chunksize=chunksize))
+        except BrokenProcessPool as e:
+            # e.g. spawn/forkserver start methods when the caller has no __main__ guard
+            logger.warning("Process pool unavailable (%s); analyzing files serially", e)
+            return list(map(self._analyze_file_or_error, code_files))
+    
+    def _analyze_file_or_error(self, file_path: Path) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Analyze a single file, returning (analysis, None) or (None, error message)."""
+        try:
+            return self.analyze_file(file_path), None
+        except Exception as e:
+            return None, str(e)
+    
     def analyze_file(self, file_path: Path) -> Dict[str, Any]:
         """
         Analyze a single file.
@@ -194,23 +376,40 @@ class EnhancedCodeAnalyzer:
         Returns:
             Dictionary containing file analysis
         """
-        logger.debug(f"Starting analysis of {file_path}")
+        logger.debug("Starting analysis of %s", file_path)
         
         language = self._detect_language(file_path)
-        logger.debug(f"Detected language: {language.value}")
+        logger.debug("Detected language: %s", language.value)
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            logger.debug(f"Read {len(content)} characters from {file_path}")
+            raw = file_path.read_bytes()
+            # Pure-ASCII Java/JS is scanned as raw bytes; everything else, and
+            # text with breaks bytes.splitlines() ignores (form feeds etc.), is
+            # decoded so line counts and numbers match str.splitlines()
+            if (language in (LanguageType.JAVA, LanguageType.JAVASCRIPT) and raw.isascii()
+                    and not _TEXT_ONLY_BREAK_BYTES_RE.search(raw)):
+                content = raw
+            else:
+                content = raw.decode('utf-8')
+            # One byte per character for raw ASCII content
+            logger.debug("Read %s characters from %s", len(content), file_path)
         except Exception as e:
-            logger.error(f"Failed to read file {file_path}: {e}")
+            logger.error("Failed to read file %s: %s", file_path, e)
             raise
         
+        # Split decoded text once for the analyzers' code snippets; raw ASCII
+        # Java/JS is only counted, and split later if a snippet is needed
+        if isinstance(content, bytes):
+            lines = None
+            line_count = _count_lines(content)
+        else:
+            lines = content.splitlines()
+            line_count = len(lines)
+        
         analysis = {
             'language': language.value,
             'size': len(content),
-            'lines': len(content.splitlines()),
+            'lines': line_count,
             'functions': [],
             'classes': [],
             'imports': [],
@@ -218,91 +417,36 @@ class EnhancedCodeAnalyzer:
             'complexity': 0
         }
         
-        logger.debug(f"Basic analysis: {analysis['lines']} lines, {analysis['size']} bytes")
+        logger.debug("Basic analysis: %s lines, %s bytes", analysis['lines'], analysis['size'])
         
         try:
-            if language == LanguageType.PYTHON:
-                logger.debug(f"Analyzing as Python file")
-                analysis.update(self._analyze_python_file(content, file_path))
-            elif language == LanguageType.JAVASCRIPT:
-                logger.debug(f"Analyzing as JavaScript file")
-                analysis.update(self._analyze_javascript_file(content, file_path))
-            elif language == LanguageType.JAVA:
-                logger.debug(f"Analyzing as Java file")
-                analysis.update(self._analyze_java_file(content, file_path))
+            file_analyzer = self._file_analyzers.get(language)
+            if file_analyzer is not None:
+                language_name, analyze = file_analyzer
+                logger.debug("Analyzing as %s file", language_name)
+                analysis.update(analyze(content, file_path, lines))
             else:
-                logger.debug(f"Unknown language, skipping detailed analysis")
+                logger.debug("Unknown language, skipping detailed analysis")
         except Exception as e:
-            logger.error(f"Error in detailed analysis of {file_path}: {e}")
+            logger.error("Error in detailed analysis of %s: %s", file_path, e)
             raise
         
-        logger.debug(f"Analysis complete for {file_path}: {len(analysis.get('functions', []))} functions, {len(analysis.get('classes', []))} classes")
+        logger.debug("Analysis complete for %s: %s functions, %s classes", file_path, len(analysis.get('functions', [])), len(analysis.get('classes', [])))
         
         return analysis
     
-    def _analyze_python_file(self, content: str, file_path: Path) -> Dict[str, Any]:
-        """Analyze a Python file using AST."""
-        logger.debug(f"Starting Python AST analysis for {file_path}")
-        
+    def _analyze_python_file(self, content: str, file_path: Path,
+                             lines: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Analyze a Python file using AST (lines: content.splitlines(), if already computed)."""
+        if lines is None:
+            lines = content.splitlines()
+        logger.debug("Starting Python AST analysis for %s", file_path)
+        
+        logger.debug("Parsing AST for %s", file_path)
         try:
-            logger.debug(f"Parsing AST for {file_path}")
-            tree = ast.parse(content)
-            logger.debug(f"AST parsing successful for {file_path}")
-            
-            functions = []
-            classes = []
-            imports = []
-            error_patterns = []
-            
-            logger.debug(f"Walking AST nodes for {file_path}")
-            for node in ast.walk(tree):
-                try:
-                    if isinstance(node, ast.FunctionDef):
-                        logger.debug(f"Found function: {node.name}")
-                        func_info = self._extract_function_info(node, content)
-                        functions.append(func_info)
-                        
-                    elif isinstance(node, ast.ClassDef):
-                        logger.debug(f"Found class: {node.name}")
-                        class_info = self._extract_class_info(node, content)
-                        classes.append(class_info)
-                        
-                    elif isinstance(node, (ast.Import, ast.ImportFrom)):
-                        logger.debug(f"Found import statement")
-                        import_info = self._extract_import_info(node)
-                        imports.append(import_info)
-                except Exception as e:
-                    logger.error(f"Error processing AST node in {file_path}: {e}")
-                    # Continue processing other nodes instead of failing completely
-                    continue
-            
-            logger.debug(f"AST walk complete for {file_path}: {len(functions)} functions, {len(classes)} classes, {len(imports)} imports")
-            
-            # Detect error patterns
-            try:
-                logger.debug(f"Detecting error patterns for {file_path}")
-                error_patterns = self._detect_python_error_patterns(tree, content)
-                logger.debug(f"Found {len(error_patterns)} error patterns in {file_path}")
-            except Exception as e:
-                logger.error(f"Error detecting patterns in {file_path}: {e}")
-                error_patterns = []
-            
-            result = {
-                'functions': [self._function_to_dict(f) for f in functions],
-                'classes': [self._class_to_dict(c) for c in classes],
-                'imports': imports,
-                'error_patterns': [self._error_pattern_to_dict(e) for e in error_patterns]
-            }
-            
-            logger.debug(f"Python analysis complete for {file_path}")
-            return result
-            
-        except Exception as e:
-            logger.error(f"AST parsing failed for {file_path}: {e}")
-            raise
-            
+            tree = ast.parse(content, filename=str(file_path), type_comments=False)
         except SyntaxError as e:
-            logger.error(f"Syntax error in {file_path}: {e}")
+            logger.error("Syntax error in %s: %s", file_path, e)
             return {
                 'functions': [],
                 'classes': [],
@@ -313,17 +457,72 @@ class EnhancedCodeAnalyzer:
                     'line': e.lineno,
                     'message': str(e),
                     'suggestion': 'Fix syntax error',
-                    'code_snippet': content.splitlines()[e.lineno - 1] if e.lineno else ''
+                    'code_snippet': lines[e.lineno - 1] if e.lineno else ''
                 }]
             }
+        logger.debug("AST parsing successful for %s", file_path)
+        
+        functions = []
+        classes = []
+        imports = []
+        error_patterns = []
+        # Nodes the error pattern checks look at, gathered during the same walk
+        error_candidates = []
+        
+        logger.debug("Walking AST nodes for %s", file_path)
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.Name, ast.BinOp)):
+                error_candidates.append(node)
+            try:
+                if isinstance(node, ast.FunctionDef):
+                    logger.debug("Found function: %s", node.name)
+                    func_info = self._extract_function_info(node, content)
+                    functions.append(func_info)
+                    
+                elif isinstance(node, ast.ClassDef):
+                    logger.debug("Found class: %s", node.name)
+                    class_info = self._extract_class_info(node, content)
+                    classes.append(class_info)
+                    
+                elif isinstance(node, (ast.Import, ast.ImportFrom)):
+                    logger.debug("Found import statement")
+                    import_info = self._extract_import_info(node)
+                    imports.append(import_info)
+            except Exception as e:
+                logger.error("Error processing AST node in %s: %s", file_path, e)
+                # Continue processing other nodes instead of failing completely
+                continue
+        
+        logger.debug("AST walk complete for %s: %s functions, %s classes, %s imports", file_path, len(functions), len(classes), len(imports))
+        
+        # Detect error patterns
+        try:
+            logger.debug("Detecting error patterns for %s", file_path)
+            error_patterns = self._detect_python_error_patterns(tree, content, lines, error_candidates)
+            logger.debug("Found %s error patterns in %s", len(error_patterns), file_path)
+        except Exception as e:
+            logger.error("Error detecting patterns in %s: %s", file_path, e)
+            error_patterns = []
+        
+        result = {
+            'functions': [self._function_to_dict(f) for f in functions],
+            'classes': [self._class_to_dict(c) for c in classes],
+            'imports': imports,
+            'error_patterns': [self._error_pattern_to_dict(e) for e in error_patterns]
+        }
+        
+        logger.debug("Python analysis complete for %s", file_path)
+        return result
     
-    def _analyze_javascript_file(self, content: str, file_path: Path) -> Dict[str, Any]:
-        """Analyze a JavaScript file."""
-        # Basic JavaScript analysis using regex patterns
-        functions = self._extract_js_functions(content)
-        classes = self._extract_js_classes(content)
-        imports = self._extract_js_imports(content)
-        error_patterns = self._detect_js_error_patterns(content)
+    def _analyze_javascript_file(self, content: bytes, file_path: Path,
+                                 lines: Optional[List[bytes]] = None) -> Dict[str, Any]:
+        """Analyze a JavaScript file (lines: content.splitlines(), if already computed)."""
+        # Basic JavaScript analysis using regex patterns, sharing one newline index
+        newlines = _line_index(content)
+        functions = self._extract_js_functions(content, newlines)
+        classes = self._extract_js_classes(content, newlines)
+        imports = self._extract_js_imports(content, newlines)
+        error_patterns = self._detect_js_error_patterns(content, newlines, lines)
         
         return {
             'functions': functions,
@@ -332,13 +531,15 @@ class EnhancedCodeAnalyzer:
             'error_patterns': error_patterns
         }
     
-    def _analyze_java_file(self, content: str, file_path: Path) -> Dict[str, Any]:
-        """Analyze a Java file."""
-        # Basic Java analysis using regex patterns
-        functions = self._extract_java_methods(content)
-        classes = self._extract_java_classes(content)
-        imports = self._extract_java_imports(content)
-        error_patterns = self._detect_java_error_patterns(content)
+    def _analyze_java_file(self, content: bytes, file_path: Path,
+                           lines: Optional[List[bytes]] = None) -> Dict[str, Any]:
+        """Analyze a Java file (lines: content.splitlines(), if already computed)."""
+        # Basic Java analysis using regex patterns, sharing one newline index
+        newlines = _line_index(content)
+        functions = list(self._iter_java_methods(content, newlines))
+        classes = list(self._iter_java_classes(content, newlines))
+        imports = list(self._iter_java_imports(content, newlines))
+        error_patterns = list(self._iter_java_error_patterns(content, newlines, lines))
         
         return {
             'functions': functions,
@@ -349,21 +550,16 @@ class EnhancedCodeAnalyzer:
     
     def _extract_function_info(self, node: ast.FunctionDef, content: str) -> FunctionInfo:
         """Extract detailed information about a function."""
-        lines = content.splitlines()
-        
-        # Get function calls within this function
+        # Get function calls and calculate complexity (simplified) in one walk
         calls = []
+        complexity = 1
         for child in ast.walk(node):
             if isinstance(child, ast.Call):
                 if isinstance(child.func, ast.Name):
                     calls.append(child.func.id)
                 elif isinstance(child.func, ast.Attribute):
                     calls.append(f"{child.func.value.id}.{child.func.attr}")
-        
-        # Calculate complexity (simplified)
-        complexity = 1
-        for child in ast.walk(node):
-            if isinstance(child, (ast.If, ast.For, ast.While, ast.Try, ast.ExceptHandler)):
+            elif isinstance(child, (ast.If, ast.For, ast.While, ast.Try, ast.ExceptHandler)):
                 complexity += 1
         
         return FunctionInfo(
@@ -416,18 +612,27 @@ class EnhancedCodeAnalyzer:
                 'line': node.lineno
             }
     
-    def _detect_python_error_patterns(self, tree: ast.AST, content: str) -> List[ErrorPattern]:
-        """Detect common error patterns in Python code."""
+    def _detect_python_error_patterns(self, tree: ast.AST, content: str,
+                                      lines: Optional[List[str]] = None,
+                                      nodes: Optional[List[ast.AST]] = None) -> List[ErrorPattern]:
+        """
+        Detect common error patterns in Python code.
+        
+        nodes, if given, are the Name and BinOp nodes of tree in ast.walk
+        order, so the tree does not have to be walked again.
+        """
         patterns = []
-        lines = content.splitlines()
+        if lines is None:
+            lines = content.splitlines()
         
         try:
-            for node in ast.walk(tree):
+            defined_names = self._collect_defined_names(tree)
+            for node in (ast.walk(tree) if nodes is None else nodes):
                 try:
                     # Undefined variables
                     if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
                         if hasattr(node, 'id') and hasattr(node, 'lineno'):
-                            if not self._is_variable_defined(node.id, node, tree):
+                            if id(node) not in defined_names:
                                 patterns.append(ErrorPattern(
                                     type='undefined_variable',
                                     severity='error',
@@ -452,43 +657,47 @@ class EnhancedCodeAnalyzer:
                                         code_snippet=lines[node.lineno - 1] if node.lineno <= len(lines) else ''
                                     ))
                 except Exception as e:
-                    logger.debug(f"Error processing AST node in error pattern detection: {e}")
+                    logger.debug("Error processing AST node in error pattern detection: %s", e)
                     continue
         except Exception as e:
-            logger.error(f"Error in error pattern detection: {e}")
+            logger.error("Error in error pattern detection: %s", e)
         
         return patterns
     
-    def _is_variable_defined(self, var_name: str, node: ast.AST, tree: ast.AST) -> bool:
-        """Check if a variable is defined before use."""
-        # Simplified check - in a real implementation, this would be more sophisticated
-        try:
-            for ancestor in self._get_ancestors(node, tree):
-                if isinstance(ancestor, ast.FunctionDef):
-                    # Check function parameters
-                    if var_name in [arg.arg for arg in ancestor.args.args]:
-                        return True
-                elif isinstance(ancestor, ast.ClassDef):
-                    # Check class attributes - safely access .id attribute
-                    for attr in ancestor.body:
-                        if isinstance(attr, ast.Assign) and attr.targets:
-                            target = attr.targets[0]
-                            if isinstance(target, ast.Name) and hasattr(target, 'id'):
-                                if target.id == var_name:
-                                    return True
-        except Exception as e:
-            logger.debug(f"Error checking variable definition for {var_name}: {e}")
+    def _collect_defined_names(self, tree: ast.AST) -> Set[int]:
+        """
+        Find Name nodes bound by an enclosing function parameter or class attribute.
         
-        return False
-    
-    def _get_ancestors(self, node: ast.AST, tree: ast.AST) -> List[ast.AST]:
-        """Get ancestor nodes of a given node."""
-        # Simplified implementation
-        ancestors = []
-        for n in ast.walk(tree):
-            if hasattr(n, 'body') and node in ast.walk(n):
-                ancestors.append(n)
-        return ancestors
+        Walks the tree once, carrying the names visible from the enclosing
+        function and class scopes, instead of searching for each node's
+        ancestors separately.
+        
+        Returns:
+            Set of id() values of the Name nodes that are defined
+        """
+        # Simplified check - in a real implementation, this would be more sophisticated
+        defined = set()
+        stack = [(tree, frozenset())]
+        while stack:
+            node, scope_names = stack.pop()
+            if isinstance(node, ast.FunctionDef):
+                # Function parameters
+                params = {arg.arg for arg in node.args.args}
+                if params:
+                    scope_names = scope_names | params
+            elif isinstance(node, ast.ClassDef):
+                # Class attributes assigned in the class body
+                attrs = {
+                    attr.targets[0].id for attr in node.body
+                    if isinstance(attr, ast.Assign) and attr.targets
+                    and isinstance(attr.targets[0], ast.Name)
+                }
+                if attrs:
+                    scope_names = scope_names | attrs
+            elif isinstance(node, ast.Name) and node.id in scope_names:
+                defined.add(id(node))
+            stack.extend((child, scope_names) for child in ast.iter_child_nodes(node))
+        return defined
     
     def _get_return_type_annotation(self, node: ast.FunctionDef) -> Optional[str]:
         """Get return type annotation from function."""
@@ -499,259 +708,214 @@ class EnhancedCodeAnalyzer:
                 elif isinstance(node.returns, ast.Constant) and hasattr(node.returns, 'value'):
                     return str(node.returns.value)
         except Exception as e:
-            logger.debug(f"Error getting return type annotation: {e}")
+            logger.debug("Error getting return type annotation: %s", e)
         return None
     
-    def _extract_js_functions(self, content: str) -> List[Dict[str, Any]]:
+    def _extract_js_functions(self, content: bytes, newlines: Optional[List[int]] = None) -> List[Dict[str, Any]]:
         """Extract JavaScript functions using regex."""
-        functions = []
-        
-        # Function declaration pattern
-        func_pattern = r'function\s+(\w+)\s*\(([^)]*)\)\s*\{'
-        matches = re.finditer(func_pattern, content)
-        
-        for match in matches:
-            functions.append({
-                'name': match.group(1),
-                'parameters': [p.strip() for p in match.group(2).split(',') if p.strip()],
-                'line': content[:match.start()].count('\n') + 1
-            })
-        
-        # Arrow function pattern
-        arrow_pattern = r'(\w+)\s*=\s*\(([^)]*)\)\s*=>'
-        matches = re.finditer(arrow_pattern, content)
-        
-        for match in matches:
-            functions.append({
-                'name': match.group(1),
-                'parameters': [p.strip() for p in match.group(2).split(',') if p.strip()],
-                'line': content[:match.start()].count('\n') + 1
+        if newlines is None:
+            newlines = _line_index(content)
+        # Declarations first, then arrow functions, each in source order
+        by_form = ([], [])
+        
+        for match in _JS_FUNCTIONS_RE.finditer(content):
+            last = match.lastindex
+            by_form[last // 2 - 1].append({
+                'name': _decode(match.group(last - 1)),
+                'parameters': [p.strip() for p in _decode(match.group(last)).split(',') if p.strip()],
+                'line': bisect_left(newlines, match.start()) + 1
             })
         
-        return functions
+        return by_form[0] + by_form[1]
     
-    def _extract_js_classes(self, content: str) -> List[Dict[str, Any]]:
+    def _extract_js_classes(self, content: bytes, newlines: Optional[List[int]] = None) -> List[Dict[str, Any]]:
         """Extract JavaScript classes using regex."""
         classes = []
+        if newlines is None:
+            newlines = _line_index(content)
         
-        class_pattern = r'class\s+(\w+)(?:\s+extends\s+(\w+))?\s*\{'
-        matches = re.finditer(class_pattern, content)
+        matches = _JS_CLASS_RE.finditer(content)
         
         for match in matches:
             classes.append({
-                'name': match.group(1),
-                'inheritance': [match.group(2)] if match.group(2) else [],
-                'line': content[:match.start()].count('\n') + 1
+                'name': _decode(match.group(1)),
+                'inheritance': [_decode(match.group(2))] if match.group(2) else [],
+                'line': bisect_left(newlines, match.start()) + 1
             })
         
         return classes
     
-    def _extract_js_imports(self, content: str) -> List[Dict[str, Any]]:
+    def _extract_js_imports(self, content: bytes, newlines: Optional[List[int]] = None) -> List[Dict[str, Any]]:
         """Extract JavaScript imports using regex."""
-        imports = []
-        
-        # ES6 import patterns
-        import_patterns = [
-            r'import\s+(\w+)\s+from\s+[\'"]([^\'"]+)[\'"]',
-            r'import\s*\{([^}]+)\}\s+from\s+[\'"]([^\'"]+)[\'"]',
-            r'import\s+\*\s+as\s+(\w+)\s+from\s+[\'"]([^\'"]+)[\'"]'
-        ]
-        
-        for pattern in import_patterns:
-            matches = re.finditer(pattern, content)
-            for match in matches:
-                imports.append({
-                    'type': 'es6_import',
-                    'names': [name.strip() for name in match.group(1).split(',')],
-                    'module': match.group(2),
-                    'line': content[:match.start()].count('\n') + 1
-                })
+        if newlines is None:
+            newlines = _line_index(content)
+        # ES6 imports grouped by form (default, named, namespace), each in source order
+        by_form = ([], [], [])
+        
+        for match in _JS_IMPORTS_RE.finditer(content):
+            last = match.lastindex
+            by_form[last // 2 - 1].append({
+                'type': 'es6_import',
+                'names': [name.strip() for name in _decode(match.group(last - 1)).split(',')],
+                'module': _decode(match.group(last)),
+                'line': bisect_left(newlines, match.start()) + 1
+            })
         
-        return imports
+        return [entry for form in by_form for entry in form]
     
-    def _detect_js_error_patterns(self, content: str) -> List[Dict[str, Any]]:
+    def _detect_js_error_patterns(self, content: bytes, newlines: Optional[List[int]] = None,
+                                  lines: Optional[List[bytes]] = None) -> List[Dict[str, Any]]:
         """Detect common error patterns in JavaScript code."""
         patterns = []
-        lines = content.splitlines()
+        if newlines is None:
+            newlines = _line_index(content)
         
         # Undefined variable patterns
-        undefined_patterns = [
-            r'console\.log\((\w+)\)',
-            r'(\w+)\.\w+',
-        ]
-        
-        for pattern in undefined_patterns:
-            matches = re.finditer(pattern, content)
+        for pattern in _JS_UNDEFINED_RES:
+            matches = pattern.finditer(content)
             for match in matches:
                 var_name = match.group(1)
                 if not self._is_js_variable_defined(var_name, content, match.start()):
-                    line_num = content[:match.start()].count('\n') + 1
+                    line_num = bisect_left(newlines, match.start()) + 1
+                    if lines is None:
+                        lines = content.splitlines()
+                    var_name = _decode(var_name)
                     patterns.append({
                         'type': 'undefined_variable',
                         'severity': 'error',
                         'line': line_num,
                         'message': f"Variable '{var_name}' might be undefined",
                         'suggestion': f"Define '{var_name}' before using it",
-                        'code_snippet': lines[line_num - 1] if line_num <= len(lines) else ''
+                        'code_snippet': _decode(lines[line_num - 1]) if line_num <= len(lines) else ''
                     })
         
         return patterns
     
-    def _is_js_variable_defined(self, var_name: str, content: str, position: int) -> bool:
+    def _is_js_variable_defined(self, var_name: bytes, content: bytes, position: int) -> bool:
         """Check if a JavaScript variable is defined before use."""
-        # Simplified check
-        before_content = content[:position]
+        # Simplified check: a declaration must at least mention the name
+        if content.find(var_name, 0, position) == -1:
+            return False
         
         # Check for variable declarations
-        declaration_patterns = [
-            rf'let\s+{var_name}\b',
-            rf'const\s+{var_name}\b',
-            rf'var\s+{var_name}\b',
-            rf'function\s+{var_name}\b',
-            rf'{var_name}\s*='
-        ]
-        
-        for pattern in declaration_patterns:
-            if re.search(pattern, before_content):
-                return True
-        
-        return False
-    
-    def _extract_java_methods(self, content: str) -> List[Dict[str, Any]]:
-        """Extract Java methods using regex."""
-        methods = []
-        
-        method_pattern = r'(?:public|private|protected)?\s*(?:static\s+)?(?:final\s+)?(?:synchronized\s+)?(?:native\s+)?(?:abstract\s+)?(?:strictfp\s+)?(?:<[^>]+>\s+)?(?:[\w\[\]]+)\s+(\w+)\s*\([^)]*\)\s*(?:throws\s+[^{]+)?\s*\{'
-        matches = re.finditer(method_pattern, content)
-        
-        for match in matches:
-            methods.append({
-                'name': match.group(1),
-                'line': content[:match.start()].count('\n') + 1
-            })
-        
-        return methods
+        return _js_decl_re(var_name).search(content, 0, position) is not None
     
-    def _extract_java_classes(self, content: str) -> List[Dict[str, Any]]:
-        """Extract Java classes using regex."""
-        classes = []
-        
-        class_pattern = r'(?:public\s+)?(?:abstract\s+)?(?:final\s+)?class\s+(\w+)(?:\s+extends\s+(\w+))?(?:\s+implements\s+([^{]+))?\s*\{'
-        matches = re.finditer(class_pattern, content)
-        
-        for match in matches:
-            classes.append({
-                'name': match.group(1),
-                'inheritance': [match.group(2)] if match.group(2) else [],
-                'interfaces': [i.strip() for i in match.group(3).split(',')] if match.group(3) else [],
-                'line': content[:match.start()].count('\n') + 1
-            })
-        
-        return classes
+    def _iter_java_methods(self, content: bytes, newlines: Optional[List[int]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield Java methods found using regex."""
+        if newlines is None:
+            newlines = _line_index(content)
+        for match in _JAVA_METHOD_RE.finditer(content):
+            yield {
+                'name': _decode(match.group(1)),
+                'line': bisect_left(newlines, match.start()) + 1
+            }
     
-    def _extract_java_imports(self, content: str) -> List[Dict[str, Any]]:
-        """Extract Java imports using regex."""
-        imports = []
-        
-        import_pattern = r'import\s+(?:static\s+)?([^;]+);'
-        matches = re.finditer(import_pattern, content)
-        
-        for match in matches:
-            imports.append({
+    def _iter_java_classes(self, content: bytes, newlines: Optional[List[int]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield Java classes found using regex."""
+        if newlines is None:
+            newlines = _line_index(content)
+        for match in _JAVA_CLASS_RE.finditer(content):
+            extends = match.group(2)
+            implements = match.group(3)
+            yield {
+                'name': _decode(match.group(1)),
+                'inheritance': [_decode(extends)] if extends else [],
+                'interfaces': [i.strip() for i in _decode(implements).split(',')] if implements else [],
+                'line': bisect_left(newlines, match.start()) + 1
+            }
+    
+    def _iter_java_imports(self, content: bytes, newlines: Optional[List[int]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield Java imports found using regex."""
+        if newlines is None:
+            newlines = _line_index(content)
+        for match in _JAVA_IMPORT_RE.finditer(content):
+            yield {
                 'type': 'java_import',
-                'module': match.group(1).strip(),
-                'line': content[:match.start()].count('\n') + 1
-            })
-        
-        return imports
+                'module': _decode(match.group(1).strip()),
+                'line': bisect_left(newlines, match.start()) + 1
+            }
     
-    def _detect_java_error_patterns(self, content: str) -> List[Dict[str, Any]]:
-        """Detect common error patterns in Java code."""
-        patterns = []
-        lines = content.splitlines()
+    def _iter_java_error_patterns(self, content: bytes, newlines: Optional[List[int]] = None,
+                                  lines: Optional[List[bytes]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield common error patterns detected in Java code (lines: content.splitlines(), if already computed)."""
+        if newlines is None:
+            newlines = _line_index(content)
+        declared = None
         
         # Null pointer access patterns
-        null_patterns = [
-            r'(\w+)\.\w+\s*\([^)]*\)',
-            r'(\w+)\.\w+\s*='
-        ]
-        
-        for pattern in null_patterns:
-            matches = re.finditer(pattern, content)
-            for match in matches:
+        for pattern in _JAVA_NULL_RES:
+            for match in pattern.finditer(content):
                 var_name = match.group(1)
-                if not self._is_java_variable_defined(var_name, content, match.start()):
-                    line_num = content[:match.start()].count('\n') + 1
-                    patterns.append({
+                if declared is None:
+                    declared = self._java_declarations(content)
+                # Defined only if declared before this use
+                if declared.get(var_name, len(content) + 1) > match.start():
+                    line_num = bisect_left(newlines, match.start()) + 1
+                    if lines is None:
+                        lines = content.splitlines()
+                    var_name = _decode(var_name)
+                    yield {
                         'type': 'null_pointer_access',
                         'severity': 'error',
                         'line': line_num,
                         'message': f"Variable '{var_name}' might be null",
                         'suggestion': f"Add null check for '{var_name}'",
-                        'code_snippet': lines[line_num - 1] if line_num <= len(lines) else ''
-                    })
-        
-        return patterns
+                        'code_snippet': _decode(lines[line_num - 1]) if line_num <= len(lines) else ''
+                    }
     
-    def _is_java_variable_defined(self, var_name: str, content: str, position: int) -> bool:
-        """Check if a Java variable is defined before use."""
-        # Simplified check
-        before_content = content[:position]
-        
-        # Check for variable declarations
-        declaration_patterns = [
-            rf'[\w\[\]]+\s+{var_name}\s*=',
-            rf'[\w\[\]]+\s+{var_name}\s*;',
-            rf'for\s*\([\w\[\]]+\s+{var_name}\s*:',
-            rf'catch\s*\([\w\[\]]+\s+{var_name}\s*\)'
-        ]
-        
-        for pattern in declaration_patterns:
-            if re.search(pattern, before_content):
-                return True
-        
-        return False
+    def _java_declarations(self, content: bytes) -> Dict[bytes, int]:
+        """Map each declared Java variable to the end offset of its first declaration."""
+        declared = {}
+        for match in _JAVA_DECL_RE.finditer(content):
+            var_name = match.group(1) or match.group(2) or match.group(3)
+            declared.setdefault(var_name, match.end())
+        return declared
     
     def _detect_language(self, file_path: Path) -> LanguageType:
         """Detect the programming language of a file."""
-        extension = file_path.suffix.lower()
-        
-        if extension == '.py':
-            return LanguageType.PYTHON
-        elif extension in ['.js', '.jsx', '.ts', '.tsx']:
-            return LanguageType.JAVASCRIPT
-        elif extension == '.java':
-            return LanguageType.JAVA
-        else:
-            return LanguageType.UNKNOWN
+        return _ext_to_lang(file_path.suffix)
     
     def _get_code_files(self) -> List[Path]:
-        """Get all code files in the project."""
-        code_extensions = {'.py', '.js', '.jsx', '.ts', '.tsx', '.java'}
+        """Get all code files in the project (scanned once per project path)."""
+        if self._code_files_cache is not None and self._code_files_cache[0] == self.project_path:
+            return self._code_files_cache[1]
+        
+        code_extensions = set(_EXT_TO_LANG)
         code_files = []
+        distribution = Counter()
         
         # Directories to skip
         skip_dirs = {'.git', '.vscode', '.idea', '__pycache__', 'node_modules', '.pytest_cache', '.mypy_cache'}
         
-        logger.info(f"Scanning for code files in {self.project_path}")
-        logger.info(f"Looking for extensions: {code_extensions}")
-        logger.info(f"Skipping directories: {skip_dirs}")
-        
-        for file_path in self.project_path.rglob('*'):
-            if file_path.is_file() and file_path.suffix.lower() in code_extensions:
-                # Skip files in directories we want to ignore
-                if not any(part in skip_dirs for part in file_path.parts):
+        logger.info("Scanning for code files in %s", self.project_path)
+        logger.info("Looking for extensions: %s", code_extensions)
+        logger.info("Skipping directories: %s", skip_dirs)
+        
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        for root, dirs, files in os.walk(self.project_path):
+            # Prune ignored directories so we never descend into them
+            dirs[:] = [d for d in dirs if d not in skip_dirs]
+            root_path = None
+            for name in files:
+                language = _ext_to_lang(os.path.splitext(name)[1])
+                if language is not LanguageType.UNKNOWN:
+                    # Build the directory Path once, only for directories holding code
+                    if root_path is None:
+                        root_path = Path(root)
+                    file_path = root_path / name
                     code_files.append(file_path)
-                    logger.debug(f"Found code file: {file_path}")
-                else:
-                    logger.debug(f"Skipping file in ignored directory: {file_path}")
+                    distribution[language.value] += 1
+                    if debug_enabled:
+                        logger.debug("Found code file: %s", file_path)
         
-        logger.info(f"Found {len(code_files)} code files in {self.project_path}")
+        logger.info("Found %s code files in %s", len(code_files), self.project_path)
         
         # Log all found files
-        for i, file_path in enumerate(code_files):
-            logger.info(f"  {i+1}. {file_path}")
+        if logger.isEnabledFor(logging.INFO):
+            for i, file_path in enumerate(code_files):
+                logger.info("  %s. %s", i+1, file_path)
         
+        self._code_files_cache = (self.project_path, code_files, dict(distribution))
         return code_files
     
     def _get_project_info(self) -> Dict[str, Any]:
@@ -765,13 +929,9 @@ class EnhancedCodeAnalyzer:
     
     def _get_language_distribution(self) -> Dict[str, int]:
         """Get distribution of programming languages in the project."""
-        distribution = {}
-        
-        for file_path in self._get_code_files():
-            language = self._detect_language(file_path)
-            distribution[language.value] = distribution.get(language.value, 0) + 1
-        
-        return distribution
+        # Counted during the code file walk
+        self._get_code_files()
+        return dict(self._code_files_cache[2])
     
     def _analyze_dependencies(self) -> Dict[str, Any]:
         """Analyze project dependencies."""
@@ -787,7 +947,7 @@ class EnhancedCodeAnalyzer:
                 'conflicts': []
             }
         except Exception as e:
-            logger.error(f"Error analyzing dependencies: {e}")
+            logger.error("Error analyzing dependencies: %s", e)
             return {'error': str(e)}
     
     def _generate_call_graph(self) -> Dict[str, Any]:
@@ -804,27 +964,18 @@ class EnhancedCodeAnalyzer:
                 'graph_file': None
             }
         except Exception as e:
-            logger.error(f"Error generating call graph: {e}")
+            logger.error("Error generating call graph: %s", e)
             return {'error': str(e)}
     
     def _calculate_project_metrics(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate project-wide metrics."""
-        total_lines = 0
-        total_functions = 0
-        total_classes = 0
-        total_errors = 0
-        
-        for file_analysis in analysis['files'].values():
-            total_lines += file_analysis.get('lines', 0)
-            total_functions += len(file_analysis.get('functions', []))
-            total_classes += len(file_analysis.get('classes', []))
-            total_errors += len(file_analysis.get('error_patterns', []))
+        files = analysis['files'].values()
         
         return {
-            'total_lines': total_lines,
-            'total_functions': total_functions,
-            'total_classes': total_classes,
-            'total_errors': total_errors,
+            'total_lines': sum(f.get('lines', 0) for f in files),
+            'total_functions': sum(len(f.get('functions', ())) for f in files),
+            'total_classes': sum(len(f.get('classes', ())) for f in files),
+            'total_errors': sum(len(f.get('error_patterns', ())) for f in files),
             'average_complexity': 0,  # Would need to calculate this
             'test_coverage': 0,  # Would need to run tests
             'maintainability_index': 0  # Would need to calculate this
@@ -864,4 +1015,19 @@ class EnhancedCodeAnalyzer:
             'message': error.message,
             'suggestion': error.suggestion,
             'code_snippet': error.code_snippet
-        } 
\ No newline at end of file
+        }
+
+
+# Per-process analyzer used by the analyze_project process pool
+_worker_analyzer: Optional[EnhancedCodeAnalyzer] = None
+
+
+def _init_analysis_worker(project_path: str):
+    """Create the analyzer for a pool worker process."""
+    global _worker_analyzer
+    _worker_analyzer = EnhancedCodeAnalyzer(project_path, max_workers=1)
+
+
+def _analyze_file_in_worker(file_path: Path) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Analyze one file inside a pool worker; the file is read in the worker."""
+    return _worker_analyzer._analyze_file_or_error(file_path)
@@ -15,6 +15,26 @@ from github.ContentFile import ContentFile
 import requests
 
 
+# File name suffixes included in repository analysis (tuples for str.endswith)
+RELEVANT_EXTENSIONS = (
+    '.py', '.js', '.ts', '.java', '.cpp', '.c', '.h', '.hpp',
+    '.md', '.txt', '.rst', '.yml', '.yaml', '.json', '.xml',
+    '.html', '.css', '.scss', '.sass', '.rb', '.go', '.rs',
+    '.php', '.swift', '.kt', '.scala', '.r', '.m', '.sh'
+)
+RELEVANT_FILENAMES = frozenset({'README', 'LICENSE'})
+CODE_EXTENSIONS = (
+    '.py', '.js', '.ts', '.java', '.cpp', '.c', '.h', '.hpp',
+    '.rb', '.go', '.rs', '.php', '.swift', '.kt', '.scala',
+    '.r', '.m', '.sh', '.pl', '.lua', '.dart'
+)
+
+# Precompiled patterns for URL validation and README parsing
+_GITHUB_URL_RE = re.compile(r'https://github\.com/([^/]+)/([^/]+)')
+_CODE_BLOCK_RE = re.compile(r'```[\w]*\n(.*?)\n```', re.DOTALL)
+_TITLE_RE = re.compile(r'^#\s+(.+)$', re.MULTILINE)
+
+
 class RepoFetcher:
     """Handles fetching and analyzing GitHub repositories."""
     
@@ -38,8 +58,7 @@ class RepoFetcher:
         Returns:
             Tuple of (is_valid, owner, repo_name)
         """
-        pattern = r'https://github\.com/([^/]+)/([^/]+)'
-        match = re.match(pattern, url)
+        match = _GITHUB_URL_RE.match(url)
         
         if match:
             owner, repo_name = match.groups()
@@ -120,14 +139,7 @@ class RepoFetcher:
         Returns:
             True if file should be included in analysis
         """
-        relevant_extensions = {
-            '.py', '.js', '.ts', '.java', '.cpp', '.c', '.h', '.hpp',
-            '.md', '.txt', '.rst', '.yml', '.yaml', '.json', '.xml',
-            '.html', '.css', '.scss', '.sass', '.rb', '.go', '.rs',
-            '.php', '.swift', '.kt', '.scala', '.r', '.m', '.sh'
-        }
-        
-        return any(filename.endswith(ext) for ext in relevant_extensions) or filename in ['README', 'LICENSE']
+        return filename.endswith(RELEVANT_EXTENSIONS) or filename in RELEVANT_FILENAMES
     
     def analyze_repo(self, repo: Repository) -> Dict:
         """
@@ -182,13 +194,7 @@ class RepoFetcher:
         Returns:
             True if file is a code file
         """
-        code_extensions = {
-            '.py', '.js', '.ts', '.java', '.cpp', '.c', '.h', '.hpp',
-            '.rb', '.go', '.rs', '.php', '.swift', '.kt', '.scala',
-            '.r', '.m', '.sh', '.pl', '.lua', '.dart'
-        }
-        
-        return any(filename.endswith(ext) for ext in code_extensions)
+        return filename.endswith(CODE_EXTENSIONS)
     
     def _analyze_structure(self, contents: List[Dict]) -> Dict:
         """
@@ -216,7 +222,7 @@ class RepoFetcher:
             # Count file types
             if self._is_code_file(filename):
                 structure['code_files'] += 1
-                ext = '.' + filename.split('.')[-1] if '.' in filename else 'unknown'
+                ext = '.' + filename.rpartition('.')[2] if '.' in filename else 'unknown'
                 structure['languages'][ext] = structure['languages'].get(ext, 0) + 1
             elif filename.endswith(('.md', '.txt', '.rst')):
                 structure['doc_files'] += 1
@@ -225,7 +231,7 @@ class RepoFetcher:
             
             # Track directories
             if '/' in path:
-                dir_path = '/'.join(path.split('/')[:-1])
+                dir_path = path.rpartition('/')[0]
                 structure['directories'].add(dir_path)
         
         structure['directories'] = list(structure['directories'])
@@ -255,13 +261,11 @@ class RepoFetcher:
         }
         
         # Extract code blocks
-        code_block_pattern = r'```[\w]*\n(.*?)\n```'
-        code_blocks = re.findall(code_block_pattern, readme_content, re.DOTALL)
+        code_blocks = _CODE_BLOCK_RE.findall(readme_content)
         sections['code_blocks'] = code_blocks
         
         # Extract title (first heading)
-        title_pattern = r'^#\s+(.+)$'
-        title_match = re.search(title_pattern, readme_content, re.MULTILINE)
+        title_match = _TITLE_RE.search(readme_content)
         if title_match:
             sections['title'] = title_match.group(1)
         
@@ -0,0 +1,313 @@
+"""
+Tests for the regex-based Java/JavaScript analysis in code_analysis.py.
+
+The analyzer scans pure-ASCII files as raw bytes and looks line numbers up
+in a line-break index. These tests pin its output to straightforward
+reference scans over decoded text (one finditer per pattern, line numbers
+counted from the text before each match), so optimizations of the
+scanners cannot silently change what gets reported.
+"""
+
+import re
+from bisect import bisect_left
+from pathlib import Path
+
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+
+import code_analysis
+from code_analysis import EnhancedCodeAnalyzer, _line_index
+
+
+JAVA_FIXTURES = {
+    'anonymous_class': (
+        'public class Foo {\n'
+        '    void go() {\n'
+        '        executor.submit(new Runnable() {\n'
+        '            public void run() { helper.call(x.y = 1); }\n'
+        '        });\n'
+        '        String name = user.getName(); String other = name.trim();\n'
+        '    }\n'
+        '}\n'
+    ),
+    'imports_and_inheritance': (
+        'import java.util.List;\n'
+        'import static java.lang.Math.max;\n'
+        '\n'
+        'public final class Repo extends Base implements Runnable, Closeable {\n'
+        '    private static <T> List<T> wrap(T item) throws IOException {\n'
+        '        for (String s : items) { s.trim(); }\n'
+        '        try { reader.close(); } catch (IOException e) { e.printStackTrace(); }\n'
+        '        cache.size = 0;\n'
+        '        return null;\n'
+        '    }\n'
+        '}\n'
+    ),
+    'non_ascii': (
+        '// héllo wörld\n'
+        'class Ä {\n'
+        '  void größe() { bär.baz(); }\n'
+        '}\n'
+    ),
+}
+
+JS_FIXTURES = {
+    'module': (
+        "import React from 'react';\n"
+        "import { useState, useEffect } from \"react\";\n"
+        "import * as utils from './utils';\n"
+        "\n"
+        "class Widget extends Component {\n"
+        "  render() { return props.title; }\n"
+        "}\n"
+        "function add(a, b) {\n"
+        "  console.log(total);\n"
+        "  return a + b;\n"
+        "}\n"
+        "const handler = (event, extra) => event.target;\n"
+        "let count = 0;\n"
+        "count.toString();\n"
+    ),
+    'non_ascii': (
+        "// café\n"
+        "function grüße(name) {\n"
+        "  return wörter.join(name);\n"
+        "}\n"
+    ),
+}
+
+
+def _line(content: str, position: int) -> int:
+    return content[:position].count('\n') + 1
+
+
+def _reference_java(content: str) -> dict:
+    """Per-kind Java scans over decoded text, as the analyzer originally did them."""
+    lines = content.splitlines()
+    functions = [
+        {'name': m.group(1), 'line': _line(content, m.start())}
+        for m in re.finditer(r'(?:public|private|protected)?\s*(?:static\s+)?(?:final\s+)?(?:synchronized\s+)?(?:native\s+)?(?:abstract\s+)?(?:strictfp\s+)?(?:<[^>]+>\s+)?(?:[\w\[\]]+)\s+(\w+)\s*\([^)]*\)\s*(?:throws\s+[^{]+)?\s*\{', content)
+    ]
+    classes = [
+        {
+            'name': m.group(1),
+            'inheritance': [m.group(2)] if m.group(2) else [],
+            'interfaces': [i.strip() for i in m.group(3).split(',')] if m.group(3) else [],
+            'line': _line(content, m.start())
+        }
+        for m in re.finditer(r'(?:public\s+)?(?:abstract\s+)?(?:final\s+)?class\s+(\w+)(?:\s+extends\s+(\w+))?(?:\s+implements\s+([^{]+))?\s*\{', content)
+    ]
+    imports = [
+        {'type': 'java_import', 'module': m.group(1).strip(), 'line': _line(content, m.start())}
+        for m in re.finditer(r'import\s+(?:static\s+)?([^;]+);', content)
+    ]
+
+    def is_defined(var_name, position):
+        before = content[:position]
+        return any(re.search(pattern, before) for pattern in (
+            rf'[\w\[\]]+\s+{var_name}\s*=',
+            rf'[\w\[\]]+\s+{var_name}\s*;',
+            rf'for\s*\([\w\[\]]+\s+{var_name}\s*:',
+            rf'catch\s*\([\w\[\]]+\s+{var_name}\s*\)'
+        ))
+
+    error_patterns = []
+    for pattern in (r'(\w+)\.\w+\s*\([^)]*\)', r'(\w+)\.\w+\s*='):
+        for m in re.finditer(pattern, content):
+            var_name = m.group(1)
+            if not is_defined(var_name, m.start()):
+                line_num = _line(content, m.start())
+                error_patterns.append({
+                    'type': 'null_pointer_access',
+                    'severity': 'error',
+                    'line': line_num,
+                    'message': f"Variable '{var_name}' might be null",
+                    'suggestion': f"Add null check for '{var_name}'",
+                    'code_snippet': lines[line_num - 1] if line_num <= len(lines) else ''
+                })
+
+    return {'functions': functions, 'classes': classes, 'imports': imports, 'error_patterns': error_patterns}
+
+
+def _reference_js(content: str) -> dict:
+    """Per-pattern JavaScript scans over decoded text, as the analyzer originally did them."""
+    lines = content.splitlines()
+    functions = [
+        {
+            'name': m.group(1),
+            'parameters': [p.strip() for p in m.group(2).split(',') if p.strip()],
+            'line': _line(content, m.start())
+        }
+        for pattern in (r'function\s+(\w+)\s*\(([^)]*)\)\s*\{', r'(\w+)\s*=\s*\(([^)]*)\)\s*=>')
+        for m in re.finditer(pattern, content)
+    ]
+    classes = [
+        {
+            'name': m.group(1),
+            'inheritance': [m.group(2)] if m.group(2) else [],
+            'line': _line(content, m.start())
+        }
+        for m in re.finditer(r'class\s+(\w+)(?:\s+extends\s+(\w+))?\s*\{', content)
+    ]
+    imports = [
+        {
+            'type': 'es6_import',
+            'names': [name.strip() for name in m.group(1).split(',')],
+            'module': m.group(2),
+            'line': _line(content, m.start())
+        }
+        for pattern in (
+            r'import\s+(\w+)\s+from\s+[\'"]([^\'"]+)[\'"]',
+            r'import\s*\{([^}]+)\}\s+from\s+[\'"]([^\'"]+)[\'"]',
+            r'import\s+\*\s+as\s+(\w+)\s+from\s+[\'"]([^\'"]+)[\'"]'
+        )
+        for m in re.finditer(pattern, content)
+    ]
+
+    def is_defined(var_name, position):
+        before = content[:position]
+        return any(re.search(pattern, before) for pattern in (
+            rf'let\s+{var_name}\b',
+            rf'const\s+{var_name}\b',
+            rf'var\s+{var_name}\b',
+            rf'function\s+{var_name}\b',
+            rf'{var_name}\s*='
+        ))
+
+    error_patterns = []
+    for pattern in (r'console\.log\((\w+)\)', r'(\w+)\.\w+'):
+        for m in re.finditer(pattern, content):
+            var_name = m.group(1)
+            if not is_defined(var_name, m.start()):
+                line_num = _line(content, m.start())
+                error_patterns.append({
+                    'type': 'undefined_variable',
+                    'severity': 'error',
+                    'line': line_num,
+                    'message': f"Variable '{var_name}' might be undefined",
+                    'suggestion': f"Define '{var_name}' before using it",
+                    'code_snippet': lines[line_num - 1] if line_num <= len(lines) else ''
+                })
+
+    return {'functions': functions, 'classes': classes, 'imports': imports, 'error_patterns': error_patterns}
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    return EnhancedCodeAnalyzer(str(tmp_path))
+
+
+def _analyze(analyzer, tmp_path: Path, name: str, content: str) -> dict:
+    file_path = tmp_path / name
+    file_path.write_bytes(content.encode('utf-8'))
+    return analyzer.analyze_file(file_path)
+
+
+@pytest.mark.parametrize('fixture', sorted(JAVA_FIXTURES))
+def test_java_extraction_matches_reference(analyzer, tmp_path, fixture):
+    content = JAVA_FIXTURES[fixture]
+    analysis = _analyze(analyzer, tmp_path, 'Fixture.java', content)
+
+    for kind, expected in _reference_java(content).items():
+        assert analysis[kind] == expected, kind
+
+
+@pytest.mark.parametrize('fixture', sorted(JS_FIXTURES))
+def test_javascript_extraction_matches_reference(analyzer, tmp_path, fixture):
+    content = JS_FIXTURES[fixture]
+    analysis = _analyze(analyzer, tmp_path, 'fixture.js', content)
+
+    for kind, expected in _reference_js(content).items():
+        assert analysis[kind] == expected, kind
+
+
+def test_java_overlapping_declarations_are_all_reported(analyzer, tmp_path):
+    analysis = _analyze(analyzer, tmp_path, 'Foo.java', JAVA_FIXTURES['anonymous_class'])
+
+    assert [(f['name'], f['line']) for f in analysis['functions']] == [('go', 1), ('Runnable', 3), ('run', 4)]
+    # The member assignment inside the call's arguments is reported too
+    assert "Variable 'x' might be null" in [e['message'] for e in analysis['error_patterns']]
+
+
+def test_size_counts_characters(analyzer, tmp_path):
+    content = JAVA_FIXTURES['non_ascii']
+    analysis = _analyze(analyzer, tmp_path, 'U.java', content)
+
+    assert analysis['size'] == len(content)
+    assert analysis['size'] < len(content.encode('utf-8'))
+    assert analysis['lines'] == len(content.splitlines())
+
+
+@pytest.mark.parametrize('newline', ['\n', '\r\n', '\r'])
+def test_line_numbers_follow_splitlines(analyzer, tmp_path, newline):
+    source = newline.join([
+        "import x from 'x';",
+        "",
+        "function first(a) {",
+        "  return a;",
+        "}",
+        "const second = (b) => b;",
+        ""
+    ])
+    analysis = _analyze(analyzer, tmp_path, 'lines.js', source)
+
+    assert analysis['lines'] == len(source.splitlines()) == 6
+    assert [(f['name'], f['line']) for f in analysis['functions']] == [('first', 3), ('second', 6)]
+    assert [i['line'] for i in analysis['imports']] == [1]
+
+
+@pytest.mark.parametrize('separator', ['\x0b', '\x0c', '\x1c', '\x1d', '\x1e'])
+def test_ascii_text_only_breaks_follow_str_splitlines(analyzer, tmp_path, separator):
+    source = 'class A {' + separator + '    void go() {\n    }\n}\n'
+    analysis = _analyze(analyzer, tmp_path, 'A.java', source)
+
+    assert analysis['lines'] == len(source.splitlines()) == 4
+    assert [(c['name'], c['line']) for c in analysis['classes']] == [('A', 1)]
+    assert analysis['functions'] == [{'name': 'go', 'line': 1}]
+
+
+@pytest.mark.parametrize('content', [b'a\nb\r\nc\rd', b'\n\nx', b'x\r\n', b'', 'a\x0cb c\nd'])
+def test_line_index_matches_splitlines(content):
+    index = _line_index(content)
+
+    # Every character of each splitlines() line maps back to that line
+    position = 0
+    for line_num, line in enumerate(content.splitlines(keepends=True), 1):
+        for offset in range(len(line.splitlines()[0])):
+            assert bisect_left(index, position + offset) + 1 == line_num
+        position += len(line)
+
+
+def test_match_starting_on_a_newline_counts_the_previous_line(analyzer, tmp_path):
+    # The method pattern's leading \s* makes its match start on the newline
+    # that ends the class line
+    analysis = _analyze(analyzer, tmp_path, 'Main.java', 'class Main {\n    void go() {\n    }\n}\n')
+
+    assert analysis['functions'] == [{'name': 'go', 'line': 1}]
+
+
+def test_broken_process_pool_falls_back_to_serial(tmp_path, monkeypatch):
+    class BrokenExecutor:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            return False
+
+        def map(self, *args, **kwargs):
+            raise BrokenProcessPool('child process terminated abruptly')
+
+    monkeypatch.setattr(code_analysis, 'ProcessPoolExecutor', BrokenExecutor)
+    for name in ('a.js', 'b.js'):
+        (tmp_path / name).write_text('function f(a) {\n  return a;\n}\n')
+
+    results = EnhancedCodeAnalyzer(str(tmp_path), max_workers=2)._analyze_files(sorted(tmp_path.glob('*.js')))
+
+    assert [([f['name'] for f in analysis['functions']], error) for analysis, error in results] == [(['f'], None)] * 2
+
+
+def test_analyzer_is_serial_by_default(tmp_path):
+    assert EnhancedCodeAnalyzer(str(tmp_path)).max_workers == 1
@@ -0,0 +1,100 @@
+"""
+Tests for batch rendering in advanced_animation/rendering/manim_scene.py.
+
+Manim itself is not needed: the batch subprocess and the per-scene render
+are replaced, and the tests check that scenes the batch did not produce are
+rendered individually from the code generated for the batch.
+"""
+
+import subprocess
+
+import pytest
+
+from advanced_animation.core.data_structures import CameraMovement, StoryboardScene
+from advanced_animation.rendering import manim_scene
+from advanced_animation.rendering.manim_scene import ManimSceneRenderer
+
+
+def _scene(scene_id: int) -> StoryboardScene:
+    return StoryboardScene(
+        id=scene_id,
+        concept=f"concept {scene_id}",
+        visual_elements=[],
+        animation_sequence=[],
+        narration="",
+        duration=1.0,
+        camera_movement=CameraMovement()
+    )
+
+
+@pytest.fixture
+def renderer(tmp_path, monkeypatch):
+    monkeypatch.setattr(manim_scene, 'MANIM_AVAILABLE', True)
+    monkeypatch.setattr(manim_scene, 'MANIMGL_AVAILABLE', False)
+
+    renderer = ManimSceneRenderer(str(tmp_path / "manim_output"))
+    renderer.generated = []
+    renderer.rendered_code = {}
+
+    def generate_scene_code(scene):
+        renderer.generated.append(scene.id)
+        return f"scene_id = {scene.id}  # call {len(renderer.generated)}\n"
+
+    def render_with_manim(scene_file):
+        scene_id = int(scene_file.stem.split('_')[1])
+        renderer.rendered_code[scene_id] = scene_file.read_text()
+        return f"single_{scene_id}.mp4"
+
+    monkeypatch.setattr(renderer, 'generate_scene_code', generate_scene_code)
+    monkeypatch.setattr(renderer, 'render_with_manim', render_with_manim)
+    return renderer
+
+
+def _fake_run(returncode, make_videos=()):
+    def run(cmd, cwd, **kwargs):
+        media_dir = cwd / "media" / "videos" / "scenes_batch" / "480p15"
+        media_dir.mkdir(parents=True, exist_ok=True)
+        for scene_id in make_videos:
+            (media_dir / f"Scene{scene_id}.mp4").touch()
+        return subprocess.CompletedProcess(cmd, returncode, stderr="boom")
+    return run
+
+
+def test_failed_batch_renders_scenes_individually_from_generated_code(renderer, monkeypatch):
+    monkeypatch.setattr(manim_scene.subprocess, 'run', _fake_run(1))
+    scenes = [_scene(1), _scene(2)]
+
+    video_files = renderer.render_scenes(scenes)
+
+    assert video_files == ["single_1.mp4", "single_2.mp4"]
+    # Code is generated once per scene and reused by the individual renders
+    assert renderer.generated == [1, 2]
+    assert renderer.rendered_code == {
+        1: "scene_id = 1  # call 1\n",
+        2: "scene_id = 2  # call 2\n"
+    }
+
+
+def test_scenes_missing_from_batch_output_are_rendered_individually(renderer, monkeypatch):
+    monkeypatch.setattr(manim_scene.subprocess, 'run', _fake_run(0, make_videos=[1]))
+    scenes = [_scene(1), _scene(2)]
+
+    video_files = renderer.render_scenes(scenes)
+
+    assert video_files[0].endswith("Scene1.mp4")
+    assert video_files[1] == "single_2.mp4"
+    assert renderer.generated == [1, 2]
+    assert renderer.rendered_code == {2: "scene_id = 2  # call 2\n"}
+
+
+def test_batch_render_keeps_no_state_between_calls(renderer, monkeypatch):
+    monkeypatch.setattr(manim_scene.subprocess, 'run', _fake_run(0, make_videos=[1, 2]))
+    scenes = [_scene(1), _scene(2)]
+    attributes = set(vars(renderer))
+
+    renderer.render_batch_with_manim(scenes)
+    renderer.render_batch_with_manim(scenes)
+
+    assert set(vars(renderer)) == attributes
+    assert renderer.generated == [1, 2, 1, 2]
+    assert not (renderer.output_dir / "scenes_batch.py").exists()
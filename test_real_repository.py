@@ -74,23 +74,24 @@ def analyze_github_repo(repo_url: str, output_dir: str = "real_repo_output"):
         if files:
             print(f"\n📁 Detailed File Analysis ({len(files)} files):")
             
-            successful_files = 0
             failed_files = 0
+            report_lines = []
             
             for i, (file_path, file_info) in enumerate(files.items()):
                 language = file_info.get('language', 'Unknown')
                 lines = file_info.get('lines', 0)
                 functions = len(file_info.get('functions', []))
                 classes = len(file_info.get('classes', []))
-                has_error = 'analysis_error' in file_info
+                error = file_info.get('analysis_error')
                 
-                if has_error:
+                report_lines.append(f"   {'❌' if error else '✅'} {i+1}. {file_path} ({language}) - {lines} lines, {functions} functions, {classes} classes")
+                if error is not None:
                     failed_files += 1
-                    print(f"   ❌ {i+1}. {file_path} ({language}) - {lines} lines, {functions} functions, {classes} classes")
-                    print(f"      Error: {file_info.get('analysis_error', 'Unknown error')}")
-                else:
-                    successful_files += 1
-                    print(f"   ✅ {i+1}. {file_path} ({language}) - {lines} lines, {functions} functions, {classes} classes")
+                    report_lines.append(f"      Error: {error}")
+            
+            # Emit the whole per-file report in one write
+            print("\n".join(report_lines))
+            successful_files = len(files) - failed_files
             
             print(f"\n📈 Analysis Results:")
             print(f"   ✅ Successfully analyzed: {successful_files} files")
@@ -171,15 +172,17 @@ def main():
 if __name__ == "__main__":
     # If no arguments provided, show usage
     if len(sys.argv) == 1:
-        print("🎬 Real Repository Animation Test")
-        print("=" * 50)
-        print("Usage: python test_real_repository.py <github_repo_url>")
-        print("\nExamples:")
-        print("  python test_real_repository.py https://github.com/algorithm-visualizer/algorithm-visualizer")
-        print("  python test_real_repository.py https://github.com/TheAlgorithms/Python")
-        print("  python test_real_repository.py https://github.com/trekhleb/javascript-algorithms")
-        print("\nOr run with specific output directory:")
-        print("  python test_real_repository.py https://github.com/user/repo --output my_animations")
-        print("\n💡 Choose repositories with interesting algorithms for best results!")
+        print("\n".join([
+            "🎬 Real Repository Animation Test",
+            "=" * 50,
+            "Usage: python test_real_repository.py <github_repo_url>",
+            "\nExamples:",
+            "  python test_real_repository.py https://github.com/algorithm-visualizer/algorithm-visualizer",
+            "  python test_real_repository.py https://github.com/TheAlgorithms/Python",
+            "  python test_real_repository.py https://github.com/trekhleb/javascript-algorithms",
+            "\nOr run with specific output directory:",
+            "  python test_real_repository.py https://github.com/user/repo --output my_animations",
+            "\n💡 Choose repositories with interesting algorithms for best results!",
+        ]))
     else:
         main() 
\ No newline at end of file